@@ -0,0 +1,25 @@
+"""Hash-partition tasks by project_id (superseded; now a no-op)
+
+Revision ID: 20261019_01
+Revises:
+Create Date: 2026-10-19
+
+Partitioning used to run here when TASK_PARTITION_COUNT > 0. Gating a linear
+revision on a setting meant installs that upgraded with it unset were stamped
+past it and could never opt in. Partitioning is now done on demand with
+"python main.py cli partition-tasks" (app.db.partitions.partition_tasks);
+the revision stays so later ones keep their down_revision.
+"""
+
+revision = "20261019_01"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    pass
+
+
+def downgrade() -> None:
+    pass
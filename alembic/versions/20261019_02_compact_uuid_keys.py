@@ -0,0 +1,104 @@
+"""Store project and task ids as native UUID (PostgreSQL) or 16-byte BLOB (SQLite)
+
+Revision ID: 20261019_02
+Revises: 20261019_01
+Create Date: 2026-10-19
+
+Existing ids keep their value; only the storage changes. New rows get
+time-ordered UUIDv7 ids from app.db.types.new_id.
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261019_02"
+down_revision = "20261019_01"
+branch_labels = None
+depends_on = None
+
+# table -> uuid columns; tasks_archive only exists once archiving has been set up
+UUID_COLUMNS = {
+    "projects": ["id"],
+    "tasks": ["id", "project_id"],
+    "tasks_archive": ["id", "project_id"],
+}
+
+
+def _existing_tables(bind):
+    tables = set(sa.inspect(bind).get_table_names())
+    return {table: columns for table, columns in UUID_COLUMNS.items() if table in tables}
+
+
+def _drop_project_foreign_keys(bind, tables):
+    dropped = []
+    inspector = sa.inspect(bind)
+    for table in tables:
+        for foreign_key in inspector.get_foreign_keys(table):
+            if foreign_key["referred_table"] == "projects":
+                op.drop_constraint(foreign_key["name"], table, type_="foreignkey")
+                dropped.append((foreign_key["name"], table))
+    return dropped
+
+
+def _restore_project_foreign_keys(dropped):
+    for name, table in dropped:
+        op.create_foreign_key(name, table, "projects", ["project_id"], ["id"], ondelete="CASCADE")
+
+
+def _convert_sqlite_values(bind, tables, to_bytes: bool):
+    # FK checks are deferred to commit, when parents and children agree again
+    op.execute("PRAGMA defer_foreign_keys = ON")
+    for table, columns in tables.items():
+        rows = bind.execute(sa.text(f"SELECT rowid, {', '.join(columns)} FROM {table}")).fetchall()
+        for row in rows:
+            values = {}
+            for index, column in enumerate(columns, start=1):
+                value = row[index]
+                if value is None:
+                    continue
+                if to_bytes:
+                    values[column] = uuid.UUID(str(value)).bytes
+                else:
+                    values[column] = str(uuid.UUID(bytes=bytes(value)))
+            assignments = ", ".join(f"{column} = :{column}" for column in values)
+            bind.execute(sa.text(f"UPDATE {table} SET {assignments} WHERE rowid = :rowid"),
+                         {**values, "rowid": row[0]})
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    tables = _existing_tables(bind)
+    
+    if bind.dialect.name == "postgresql":
+        dropped = _drop_project_foreign_keys(bind, tables)
+        for table, columns in tables.items():
+            for column in columns:
+                op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE uuid USING {column}::uuid")
+        _restore_project_foreign_keys(dropped)
+        return
+    
+    _convert_sqlite_values(bind, tables, to_bytes=True)
+    for table, columns in tables.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, type_=sa.LargeBinary(16), existing_type=sa.String(36))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    tables = _existing_tables(bind)
+    
+    if bind.dialect.name == "postgresql":
+        dropped = _drop_project_foreign_keys(bind, tables)
+        for table, columns in tables.items():
+            for column in columns:
+                op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE varchar(36) USING {column}::text")
+        _restore_project_foreign_keys(dropped)
+        return
+    
+    _convert_sqlite_values(bind, tables, to_bytes=False)
+    for table, columns in tables.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, type_=sa.String(36), existing_type=sa.LargeBinary(16))
@@ -0,0 +1,36 @@
+"""Add a version counter to projects and tasks for optimistic concurrency
+
+Revision ID: 20261019_03
+Revises: 20261019_02
+Create Date: 2026-10-19
+
+Existing rows start at version 1. Updates bump it in the same statement, and
+clients can send the version they read to get a 409 instead of a lost update.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261019_03"
+down_revision = "20261019_02"
+branch_labels = None
+depends_on = None
+
+# tasks_archive only exists once archiving has been set up
+VERSIONED_TABLES = ["projects", "tasks", "tasks_archive"]
+
+
+def _existing_tables(bind):
+    tables = set(sa.inspect(bind).get_table_names())
+    return [table for table in VERSIONED_TABLES if table in tables]
+
+
+def upgrade() -> None:
+    for table in _existing_tables(op.get_bind()):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    for table in _existing_tables(op.get_bind()):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("version")
@@ -0,0 +1,32 @@
+"""Index lower(projects.name) and lower(tasks.title) for typeahead prefix lookups
+
+Revision ID: 20261019_04
+Revises: 20261019_03
+Create Date: 2026-10-19
+
+PostgreSQL gets text_pattern_ops so LIKE 'abc%' can use the index under any
+collation; SQLite serves the same lookups as range comparisons on lower().
+"""
+from alembic import op
+
+revision = "20261019_04"
+down_revision = "20261019_03"
+branch_labels = None
+depends_on = None
+
+# index -> (table, column)
+PREFIX_INDEXES = {
+    "ix_projects_name_lower": ("projects", "name"),
+    "ix_tasks_title_lower": ("tasks", "title"),
+}
+
+
+def upgrade() -> None:
+    operator_class = " text_pattern_ops" if op.get_bind().dialect.name == "postgresql" else ""
+    for index, (table, column) in PREFIX_INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table} (lower({column}){operator_class})")
+
+
+def downgrade() -> None:
+    for index in PREFIX_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index}")
@@ -0,0 +1,30 @@
+"""Index tasks by (status, deadline, id) and (project_id, status, deadline, id)
+
+Revision ID: 20261019_05
+Revises: 20261019_04
+Create Date: 2026-10-19
+
+GET /tasks/due reads the nearest deadlines of each open status with a LIMIT,
+so it only touches K index entries per status instead of sorting every task.
+"""
+from alembic import op
+
+revision = "20261019_05"
+down_revision = "20261019_04"
+branch_labels = None
+depends_on = None
+
+DUE_INDEXES = {
+    "ix_tasks_status_deadline": "status, deadline, id",
+    "ix_tasks_project_status_deadline": "project_id, status, deadline, id",
+}
+
+
+def upgrade() -> None:
+    for index, columns in DUE_INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {index} ON tasks ({columns})")
+
+
+def downgrade() -> None:
+    for index in DUE_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index}")
@@ -0,0 +1,35 @@
+"""Add a heartbeat to jobs so ones left running by a dead worker can be re-queued
+
+Revision ID: 20261019_06
+Revises: 20261019_05
+Create Date: 2026-10-19
+
+Workers renew heartbeat_at on claim and on every progress report. Running jobs
+whose heartbeat is older than JOB_LEASE_SECONDS go back to the queue.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20261019_06"
+down_revision = "20261019_05"
+branch_labels = None
+depends_on = None
+
+
+def _has_jobs_table(bind) -> bool:
+    # init-db creates the jobs table; it may not exist yet on older installs
+    return "jobs" in sa.inspect(bind).get_table_names()
+
+
+def upgrade() -> None:
+    if not _has_jobs_table(op.get_bind()):
+        return
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.add_column(sa.Column("heartbeat_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    if not _has_jobs_table(op.get_bind()):
+        return
+    with op.batch_alter_table("jobs") as batch_op:
+        batch_op.drop_column("heartbeat_at")
@@ -0,0 +1,104 @@
+import asyncio
+import heapq
+import itertools
+import re
+from starlette.responses import JSONResponse
+from config import Config
+
+API_PREFIX = "/api/v1/"
+
+# Lower value = admitted first when requests are queued
+PRIORITY_SINGLE_ITEM = 0
+PRIORITY_WRITE = 1
+PRIORITY_BULK = 2
+
+_SINGLE_ITEM_PATH = re.compile(r"^/api/v1/(projects|tasks)/(?!(overdue|stats)/?$)[^/]+/?$")
+_BULK_PATHS = re.compile(r"^/api/v1/(projects|tasks)/?$|^/api/v1/tasks/overdue/")
+
+def route_priority(method: str, path: str) -> int:
+    if method == "GET" and _SINGLE_ITEM_PATH.match(path):
+        return PRIORITY_SINGLE_ITEM
+    if method == "GET":
+        return PRIORITY_BULK
+    # Bulk status change and bulk delete; a POST to a collection creates a single item
+    if method in ("PATCH", "DELETE") and _BULK_PATHS.match(path):
+        return PRIORITY_BULK
+    return PRIORITY_WRITE
+
+class AdmissionController:
+    """Caps concurrent DB-bound requests with a short, priority-ordered wait queue."""
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._queued = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+
+    async def acquire(self, priority: int) -> bool:
+        if self._active < self.max_concurrency and not self._queued:
+            self._active += 1
+            return True
+        if self._queued >= self.max_queue:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        self._queued += 1
+        try:
+            # A granted waiter inherits the releasing request's slot
+            await asyncio.wait_for(waiter, self.queue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            return self._granted(waiter)
+        except asyncio.CancelledError:
+            if self._granted(waiter):
+                self.release()
+            raise
+        finally:
+            waiter.cancel()
+            self._queued -= 1
+
+    @staticmethod
+    def _granted(waiter: asyncio.Future) -> bool:
+        return waiter.done() and not waiter.cancelled()
+
+    def release(self):
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():
+                waiter.set_result(True)
+                return
+        self._active -= 1
+
+class AdmissionControlMiddleware:
+    def __init__(self, app, controller: AdmissionController = None):
+        self.app = app
+        self.controller = controller or AdmissionController(
+            Config.ADMISSION_MAX_CONCURRENCY,
+            Config.ADMISSION_MAX_QUEUE,
+            Config.ADMISSION_QUEUE_TIMEOUT_SECONDS
+        )
+
+    async def __call__(self, scope, receive, send):
+        # Health checks, docs and the root page never touch the database
+        if scope["type"] != "http" or not scope["path"].startswith(API_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        priority = route_priority(scope["method"], scope["path"])
+        if not await self.controller.acquire(priority):
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry later"},
+                status_code=503,
+                headers={"Retry-After": str(Config.ADMISSION_RETRY_AFTER_SECONDS)}
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
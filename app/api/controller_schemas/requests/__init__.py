@@ -1,7 +1,17 @@
-from .project_request import ProjectCreateRequest, ProjectUpdateRequest, ProjectResponse
-from .task_request import TaskCreateRequest, TaskUpdateRequest, TaskResponse
+from .project_request import (
+    ProjectCreateRequest, ProjectUpdateRequest, ProjectResponse, ProjectWithTasksResponse, ProjectSuggestion
+)
+from .job_request import JobResponse
+from .profile_request import ProfileResponse, ProfiledRunResponse
+from .stats_request import StatsResponse
+from .task_request import (
+    TaskCreateRequest, TaskUpdateRequest, TaskResponse,
+    TaskBulkDeleteRequest, TaskBulkStatusRequest, TaskBulkResponse, TaskSuggestion
+)
 
 __all__ = [
-    "ProjectCreateRequest", "ProjectUpdateRequest", "ProjectResponse",
-    "TaskCreateRequest", "TaskUpdateRequest", "TaskResponse"
+    "ProjectCreateRequest", "ProjectUpdateRequest", "ProjectResponse", "ProjectWithTasksResponse", "ProjectSuggestion",
+    "TaskCreateRequest", "TaskUpdateRequest", "TaskResponse",
+    "TaskBulkDeleteRequest", "TaskBulkStatusRequest", "TaskBulkResponse", "TaskSuggestion",
+    "JobResponse", "StatsResponse", "ProfileResponse", "ProfiledRunResponse"
 ]
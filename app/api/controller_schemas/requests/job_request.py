@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Any, Optional
+from datetime import datetime
+
+class JobResponse(BaseModel):
+    id: str
+    type: str
+    status: str
+    payload: dict
+    processed: int
+    total: Optional[int] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
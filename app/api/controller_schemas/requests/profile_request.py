@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class ProfileResponse(BaseModel):
+    name: str
+    mode: str
+    size: int
+    created_at: datetime
+
+class ProfiledRunResponse(BaseModel):
+    name: str
+    mode: str
+    result: Optional[str] = None
+    error: Optional[str] = None
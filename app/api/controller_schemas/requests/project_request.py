@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
+from .task_request import TaskResponse
 
 class ProjectCreateRequest(BaseModel):
     name: str = Field(..., min_length=1, max_length=100, description="Project name")
@@ -9,6 +10,7 @@ class ProjectCreateRequest(BaseModel):
 class ProjectUpdateRequest(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     description: Optional[str] = None
+    version: Optional[int] = Field(None, ge=1, description="Apply only if the project is still at this version; 409 otherwise")
 
 class ProjectResponse(BaseModel):
     id: str
@@ -16,8 +18,16 @@ class ProjectResponse(BaseModel):
     description: Optional[str]
     created_at: datetime
     updated_at: Optional[datetime] = None  # Make sure this is Optional with default None
+    version: Optional[int] = None
     
     model_config = ConfigDict(
         from_attributes=True,
         populate_by_name=True
     )
+
+class ProjectSuggestion(BaseModel):
+    id: str
+    name: str
+
+class ProjectWithTasksResponse(ProjectResponse):
+    tasks: List[TaskResponse] = []
@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import datetime
+
+class DailyCountResponse(BaseModel):
+    date: str
+    created: int
+    closed: int
+
+class CycleTimeResponse(BaseModel):
+    samples: int
+    median_hours: Optional[float] = None
+    p90_hours: Optional[float] = None
+    mean_hours: Optional[float] = None
+
+class DeadlineOutcomesResponse(BaseModel):
+    closed: int
+    with_deadline: int
+    on_time: int
+    late: int  # includes tasks auto-closed after their deadline passed
+    on_time_rate: Optional[float] = None
+    late_rate: Optional[float] = None
+
+class DeadlineBucketResponse(BaseModel):
+    label: str
+    count: int
+
+class StatsResponse(BaseModel):
+    project_id: Optional[str] = None  # None for the org-wide report
+    days: int
+    generated_at: datetime
+    status_counts: Dict[str, int]
+    daily: List[DailyCountResponse]
+    cycle_time: CycleTimeResponse
+    deadline_outcomes: DeadlineOutcomesResponse
+    overdue: int
+    upcoming_deadlines: List[DeadlineBucketResponse]
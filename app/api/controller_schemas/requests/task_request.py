@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class TaskCreateRequest(BaseModel):
@@ -14,6 +14,21 @@ class TaskUpdateRequest(BaseModel):
     description: Optional[str] = None
     status: Optional[str] = Field(None, pattern="^(todo|doing|done)$")
     deadline: Optional[str] = Field(None, description="Format: YYYY-MM-DD")
+    version: Optional[int] = Field(None, ge=1, description="Apply only if the task is still at this version; 409 otherwise")
+
+class TaskBulkDeleteRequest(BaseModel):
+    task_ids: Optional[List[str]] = Field(None, description="Explicit task ids; combined with any filters below")
+    project_id: Optional[str] = None
+    status: Optional[str] = Field(None, pattern="^(todo|doing|done)$")
+    deadline_from: Optional[str] = Field(None, description="Format: YYYY-MM-DD")
+    deadline_to: Optional[str] = Field(None, description="Format: YYYY-MM-DD")
+
+class TaskBulkStatusRequest(TaskBulkDeleteRequest):
+    new_status: str = Field(..., pattern="^(todo|doing|done)$")
+
+class TaskBulkResponse(BaseModel):
+    message: str
+    affected: int
 
 class TaskResponse(BaseModel):
     id: str  # Changed to str for UUID
@@ -23,7 +38,13 @@ class TaskResponse(BaseModel):
     status: str
     deadline: Optional[datetime]
     created_at: datetime
-    updated_at: Optional[datetime]
+    updated_at: Optional[datetime] = None
+    version: Optional[int] = None
 
     class Config:
         from_attributes = True
+
+class TaskSuggestion(BaseModel):
+    id: str
+    project_id: str
+    title: str
@@ -1,4 +1,5 @@
 from .projects_controller import router as projects_router
 from .tasks_controller import router as tasks_router
+from .jobs_controller import router as jobs_router
 
-__all__ = ["projects_router", "tasks_router"]
+__all__ = ["projects_router", "tasks_router", "jobs_router"]
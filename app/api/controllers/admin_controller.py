@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from typing import List
+
+from app.api.controller_schemas.requests.profile_request import ProfileResponse, ProfiledRunResponse
+from app.api.profiling import require_admin
+from app.jobs.autoclose import run_autoclose_once
+from app.profiling.profiler import RequestProfile, list_profiles, profile_path, rate_limiter
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)]
+)
+
+@router.get("/profiles", response_model=List[ProfileResponse])
+def get_profiles():
+    
+    return list_profiles()
+
+@router.get("/profiles/{name}")
+def download_profile(name: str):
+    
+    path = profile_path(name)
+    if not path:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, filename=name, media_type="application/octet-stream")
+
+@router.post("/profiles/autoclose", response_model=ProfiledRunResponse)
+def profile_autoclose(mode: str = Query("cpu", pattern="^(cpu|sample|memory)$")):
+    
+    # One auto-close cycle, run now in this worker thread under the chosen profiler
+    if not rate_limiter.try_acquire():
+        raise HTTPException(
+            status_code=429,
+            detail="Profiling rate limit reached or a profile is already running",
+            headers={"Retry-After": "60"}
+        )
+    profile = RequestProfile(mode, "run_autoclose")
+    try:
+        result = profile.run(run_autoclose_once)
+        return {"name": profile.name, "mode": mode, "result": result}
+    except Exception as e:
+        return {"name": profile.name, "mode": mode, "error": str(e)}
+    finally:
+        rate_limiter.release()
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.controller_schemas.requests.job_request import JobResponse
+from app.api.profiling import ProfiledRoute
+from app.db.session import get_db
+from app.repositories.job_repository import JobRepository
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"],
+    route_class=ProfiledRoute
+)
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: str, db: Session = Depends(get_db)):
+    
+    # Always read from the primary: progress must never go backwards between polls
+    job = JobRepository(db).get_by_id(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
@@ -1,19 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from typing import List, Optional
 from sqlalchemy.orm import Session
-import uuid
 from datetime import datetime
 
 from app.api.controller_schemas.requests.project_request import (
     ProjectCreateRequest, 
     ProjectUpdateRequest, 
-    ProjectResponse
+    ProjectResponse,
+    ProjectSuggestion,
+    ProjectWithTasksResponse
 )
-from app.db.session import get_db
+from app.api.controller_schemas.requests.job_request import JobResponse
+from app.api.controller_schemas.requests.stats_request import StatsResponse
+from app.api.fields import parse_fields, sparse_response
+from app.api.profiling import ProfiledRoute
+from app.db.session import get_db, get_read_db
+from app.db.types import new_id
+from app.exceptions.repository_exceptions import (
+    DuplicateProjectException,
+    ProjectNotFoundException,
+    VersionConflictException
+)
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.job_repository import JobRepository
+from app.repositories.task_repository import TaskRepository
+from app.services.job_service import JobService
+from app.services.stats_service import StatsService
+from config import Config
 
 router = APIRouter(
     prefix="/projects",
-    tags=["projects"]
+    tags=["projects"],
+    route_class=ProfiledRoute
 )
 
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
@@ -29,7 +47,7 @@ def create_project(project: ProjectCreateRequest, db: Session = Depends(get_db))
         
         # Create new project
         db_project = Project(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             name=project.name,
             description=project.description
         )
@@ -43,14 +61,51 @@ def create_project(project: ProjectCreateRequest, db: Session = Depends(get_db))
             "name": db_project.name,
             "description": db_project.description,
             "created_at": db_project.created_at,
-            "updated_at": None  # Explicitly set to None
+            "updated_at": None,  # Explicitly set to None
+            "version": db_project.version
         }
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
+def _projects_with_tasks(
+    db: Session,
+    include: Optional[str],
+    selected: Optional[List[str]],
+    task_limit: Optional[int],
+    task_status: Optional[str],
+    project_id: Optional[str] = None
+):
+    if include != "tasks":
+        raise HTTPException(status_code=400, detail="include only supports 'tasks'")
+    
+    cap = Config.PROJECT_INCLUDE_MAX_TASKS
+    if cap > 0:
+        task_limit = min(task_limit, cap) if task_limit else cap
+    
+    projects = ProjectRepository(db).get_with_tasks(project_id, task_limit, task_status)
+    result = []
+    for project in projects:
+        data = ProjectWithTasksResponse.model_validate(project).model_dump()
+        if selected:
+            data = {field: data[field] for field in [*selected, "tasks"]}
+        result.append(data)
+    return result
+
 @router.get("/", response_model=List[ProjectResponse])
-def list_projects(db: Session = Depends(get_db)):
+def list_projects(
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    task_limit: Optional[int] = Query(None, ge=1),
+    task_status: Optional[str] = Query(None, pattern="^(todo|doing|done)$"),
+    db: Session = Depends(get_read_db)
+):
+    
+    selected = parse_fields(fields, ProjectRepository.SPARSE_FIELDS)
+    if include:
+        return sparse_response(_projects_with_tasks(db, include, selected, task_limit, task_status))
+    if selected:
+        return sparse_response(ProjectRepository(db).get_fields(selected))
     
     from app.models.project import Project
     projects = db.query(Project).order_by(Project.created_at).all()
@@ -62,26 +117,62 @@ def list_projects(db: Session = Depends(get_db)):
             "name": project.name,
             "description": project.description,
             "created_at": project.created_at,
-            "updated_at": None
+            "updated_at": None,
+            "version": project.version
         }
         for project in projects
     ]
 
+# Declared before /{project_id} so "stats" and "suggest" are not taken for a project id
+@router.get("/stats", response_model=StatsResponse)
+def get_organization_stats(days: int = Query(30, ge=1, le=366), db: Session = Depends(get_read_db)):
+    
+    stats_service = StatsService(TaskRepository(db), ProjectRepository(db))
+    return stats_service.get_organization_stats(days)
+
+@router.get("/suggest", response_model=List[ProjectSuggestion])
+def suggest_projects(
+    prefix: str = Query(..., min_length=1, max_length=255),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_read_db)
+):
+    
+    # Served from the in-process prefix index; no query per keystroke once it is loaded
+    return ProjectRepository(db).suggest(prefix, limit)
+
+@router.get("/{project_id}/stats", response_model=StatsResponse)
+def get_project_stats(project_id: str, days: int = Query(30, ge=1, le=366), db: Session = Depends(get_read_db)):
+    
+    stats_service = StatsService(TaskRepository(db), ProjectRepository(db))
+    success, result = stats_service.get_project_stats(project_id, days)
+    if not success:
+        raise HTTPException(status_code=404, detail=result)
+    return result
+
 @router.get("/{project_id}", response_model=ProjectResponse)
-def get_project(project_id: str, db: Session = Depends(get_db)):
+def get_project(
+    project_id: str,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    task_limit: Optional[int] = Query(None, ge=1),
+    task_status: Optional[str] = Query(None, pattern="^(todo|doing|done)$"),
+    db: Session = Depends(get_read_db)
+):
     
-    from app.models.project import Project
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
+    selected = parse_fields(fields, ProjectRepository.SPARSE_FIELDS)
+    if include:
+        projects = _projects_with_tasks(db, include, selected, task_limit, task_status, project_id)
+        if not projects:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return sparse_response(projects[0])
+    
+    summary = ProjectRepository(db).get_summary(project_id)
+    if not summary:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    return {
-        "id": project.id,
-        "name": project.name,
-        "description": project.description,
-        "created_at": project.created_at,
-        "updated_at": None
-    }
+    if selected:
+        return sparse_response({field: summary[field] for field in selected})
+    return {**summary, "updated_at": None}
 
 @router.put("/{project_id}", response_model=ProjectResponse)
 def update_project(
@@ -90,54 +181,39 @@ def update_project(
     db: Session = Depends(get_db)
 ):
     
-    from app.models.project import Project
+    update_data = project_data.dict(exclude_unset=True)
+    expected_version = update_data.pop("version", None)
     
     try:
-        project = db.query(Project).filter(Project.id == project_id).first()
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-        
-        update_data = project_data.dict(exclude_unset=True)
-        
-        # Check if new name conflicts with existing project
-        if 'name' in update_data and update_data['name'] != project.name:
-            existing = db.query(Project).filter(
-                Project.name == update_data['name'],
-                Project.id != project_id
-            ).first()
-            if existing:
-                raise HTTPException(status_code=400, detail="Another project with this name already exists")
-        
-        for field, value in update_data.items():
-            setattr(project, field, value)
-        
-        db.commit()
-        db.refresh(project)
-        
-        return {
-            "id": project.id,
-            "name": project.name,
-            "description": project.description,
-            "created_at": project.created_at,
-            "updated_at": None
-        }
+        # A single UPDATE ... RETURNING; the returned row is already current, so no refresh
+        project = ProjectRepository(db).update_returning(project_id, update_data, expected_version)
+    except ProjectNotFoundException:
+        raise HTTPException(status_code=404, detail="Project not found")
+    except VersionConflictException as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except DuplicateProjectException:
+        raise HTTPException(status_code=400, detail="Another project with this name already exists")
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "id": project.id,
+        "name": project.name,
+        "description": project.description,
+        "created_at": project.created_at,
+        "updated_at": None,
+        "version": project.version
+    }
 
-@router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_project(project_id: str, db: Session = Depends(get_db)):
+@router.delete("/{project_id}", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def delete_project(project_id: str, response: Response, db: Session = Depends(get_db)):
     
-    from app.models.project import Project
+    # Deleting a project and all its tasks runs as a background job; poll the Location URL
+    job_service = JobService(JobRepository(db), ProjectRepository(db))
+    success, result = job_service.enqueue_project_delete(project_id)
+    if not success:
+        raise HTTPException(status_code=404 if result == "Project not found" else 400, detail=result)
     
-    try:
-        project = db.query(Project).filter(Project.id == project_id).first()
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
-        
-        db.delete(project)
-        db.commit()
-        return None
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=400, detail=str(e))
+    response.headers["Location"] = f"/api/v1/jobs/{result.id}"
+    return result.to_dict()
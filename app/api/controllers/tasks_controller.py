@@ -1,37 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from datetime import datetime
-import uuid
+from datetime import datetime, timedelta
 
 from app.api.controller_schemas.requests.task_request import (
     TaskCreateRequest,
     TaskUpdateRequest,
-    TaskResponse
+    TaskResponse,
+    TaskBulkDeleteRequest,
+    TaskBulkStatusRequest,
+    TaskBulkResponse,
+    TaskSuggestion
 )
-from app.db.session import get_db
+from app.api.fields import parse_fields, sparse_response
+from app.api.profiling import ProfiledRoute
+from app.db.session import get_db, get_read_db
+from app.db.types import new_id
+from app.exceptions.repository_exceptions import TaskNotFoundException, VersionConflictException
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.task_repository import TaskRepository, status_update_values
+from app.services.task_service import TaskService
+
+_WITHIN_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
 
 router = APIRouter(
     prefix="/tasks",
-    tags=["tasks"]
+    tags=["tasks"],
+    route_class=ProfiledRoute
 )
 
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 def create_task(task: TaskCreateRequest, db: Session = Depends(get_db)):
     
     from app.models.task import Task
-    from app.models.project import Project
     
     try:
         # Find project by name
-        project = db.query(Project).filter(Project.name == task.project_name).first()
-        if not project:
+        project_id = ProjectRepository(db).get_id_by_name(task.project_name, verify=True)
+        if not project_id:
             raise HTTPException(status_code=404, detail=f"Project '{task.project_name}' not found")
         
         # Create new task
         db_task = Task(
-            id=str(uuid.uuid4()),
-            project_id=project.id,
+            id=new_id(),
+            project_id=project_id,
             title=task.title,
             description=task.description,
             status=task.status,
@@ -51,21 +63,115 @@ def create_task(task: TaskCreateRequest, db: Session = Depends(get_db)):
 @router.get("/", response_model=List[TaskResponse])
 def list_tasks(
     project_id: Optional[str] = None,
-    db: Session = Depends(get_db)
+    include_archived: bool = False,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
     
+    selected = parse_fields(fields, TaskRepository.SPARSE_FIELDS)
+    if selected:
+        return sparse_response(TaskRepository(db).get_fields(selected, project_id, include_archived))
+    
     from app.models.task import Task
     query = db.query(Task)
     if project_id:
         query = query.filter(Task.project_id == project_id)
     tasks = query.order_by(Task.created_at).all()
+    if include_archived:
+        tasks = sorted(
+            tasks + TaskRepository(db).get_archived(project_id),
+            key=lambda task: task.created_at or datetime.min
+        )
     return tasks
 
+def _parse_bulk_deadlines(selection: TaskBulkDeleteRequest):
+    try:
+        deadline_from = datetime.fromisoformat(selection.deadline_from) if selection.deadline_from else None
+        deadline_to = datetime.fromisoformat(selection.deadline_to) if selection.deadline_to else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date format: {e}")
+    return deadline_from, deadline_to
+
+@router.patch("/", response_model=TaskBulkResponse)
+def bulk_change_task_status(selection: TaskBulkStatusRequest, db: Session = Depends(get_db)):
+    
+    deadline_from, deadline_to = _parse_bulk_deadlines(selection)
+    task_service = TaskService(TaskRepository(db), ProjectRepository(db))
+    success, result = task_service.bulk_change_status(
+        selection.new_status,
+        task_ids=selection.task_ids,
+        project_id=selection.project_id,
+        status=selection.status,
+        deadline_from=deadline_from,
+        deadline_to=deadline_to
+    )
+    if not success:
+        raise HTTPException(status_code=400, detail=result)
+    return {"message": f"Updated {result} task(s)", "affected": result}
+
+@router.delete("/", response_model=TaskBulkResponse)
+def bulk_delete_tasks(selection: TaskBulkDeleteRequest, db: Session = Depends(get_db)):
+    
+    deadline_from, deadline_to = _parse_bulk_deadlines(selection)
+    task_service = TaskService(TaskRepository(db), ProjectRepository(db))
+    success, result = task_service.bulk_delete_tasks(
+        task_ids=selection.task_ids,
+        project_id=selection.project_id,
+        status=selection.status,
+        deadline_from=deadline_from,
+        deadline_to=deadline_to
+    )
+    if not success:
+        raise HTTPException(status_code=400, detail=result)
+    return {"message": f"Deleted {result} task(s)", "affected": result}
+
+# Declared before /{task_id} so "due" and "suggest" are not taken for a task id
+@router.get("/due", response_model=List[TaskResponse])
+def get_due_tasks(
+    k: int = Query(20, ge=1, le=100),
+    within: Optional[str] = Query(None, max_length=12, pattern="^[0-9]+[mhdw]$", description="e.g. 90m, 12h, 7d, 2w"),
+    project_id: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    
+    until = None
+    if within:
+        try:
+            until = datetime.utcnow() + timedelta(**{_WITHIN_UNITS[within[-1]]: int(within[:-1])})
+        except (OverflowError, ValueError):
+            raise HTTPException(status_code=400, detail="within is too large")
+    return TaskRepository(db).get_due(k, until, project_id)
+
+@router.get("/suggest", response_model=List[TaskSuggestion])
+def suggest_tasks(
+    prefix: str = Query(..., min_length=1, max_length=255),
+    project_id: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_read_db)
+):
+    
+    # Served from the in-process prefix index; no query per keystroke once it is loaded
+    return TaskRepository(db).suggest(prefix, limit, project_id)
+
 @router.get("/{task_id}", response_model=TaskResponse)
-def get_task(task_id: str, db: Session = Depends(get_db)):
+def get_task(
+    task_id: str,
+    include_archived: bool = False,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    
+    selected = parse_fields(fields, TaskRepository.SPARSE_FIELDS)
+    if selected:
+        task = TaskRepository(db).get_fields_by_id(task_id, selected, include_archived)
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        return sparse_response(task)
     
     from app.models.task import Task
     task = db.query(Task).filter(Task.id == task_id).first()
+    if not task and include_archived:
+        task = TaskRepository(db).get_archived_by_id(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
@@ -77,28 +183,27 @@ def update_task(
     db: Session = Depends(get_db)
 ):
     
-    from app.models.task import Task
+    update_data = task_data.dict(exclude_unset=True)
+    expected_version = update_data.pop("version", None)
+    
+    # Convert deadline string to datetime if provided
+    if 'deadline' in update_data and update_data['deadline']:
+        try:
+            update_data['deadline'] = datetime.fromisoformat(update_data['deadline'])
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid deadline format. Use YYYY-MM-DD")
+    
+    # closed_at follows the status inside the same statement
+    if update_data.get('status'):
+        update_data.update(status_update_values(update_data['status']))
     
     try:
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if not task:
-            raise HTTPException(status_code=404, detail="Task not found")
-        
-        update_data = task_data.dict(exclude_unset=True)
-        
-        # Convert deadline string to datetime if provided
-        if 'deadline' in update_data and update_data['deadline']:
-            try:
-                update_data['deadline'] = datetime.fromisoformat(update_data['deadline'])
-            except ValueError:
-                raise HTTPException(status_code=400, detail="Invalid deadline format. Use YYYY-MM-DD")
-        
-        for field, value in update_data.items():
-            setattr(task, field, value)
-        z
-        db.commit()
-        db.refresh(task)
-        return task
+        # A single UPDATE ... RETURNING; the returned row is already current, so no refresh
+        return TaskRepository(db).update_returning(task_id, update_data, expected_version)
+    except TaskNotFoundException:
+        raise HTTPException(status_code=404, detail="Task not found")
+    except VersionConflictException as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
@@ -121,15 +226,19 @@ def delete_task(task_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/overdue/", response_model=List[TaskResponse])
-def get_overdue_tasks(db: Session = Depends(get_db)):
+def get_overdue_tasks(fields: Optional[str] = None, db: Session = Depends(get_read_db)):
     
     from app.models.task import Task, TaskStatus
     from datetime import datetime
     now = datetime.utcnow()
-    tasks = db.query(Task).filter(
-        Task.deadline < now,
-        Task.status != TaskStatus.DONE
-    ).all()
+    overdue = (Task.deadline < now, Task.status != TaskStatus.DONE)
+    
+    selected = parse_fields(fields, TaskRepository.SPARSE_FIELDS)
+    if selected:
+        rows = db.query(*[getattr(Task, field) for field in selected]).filter(*overdue)
+        return sparse_response([dict(row._mapping) for row in rows])
+    
+    tasks = db.query(Task).filter(*overdue).all()
     return tasks
 
 @router.post("/overdue/close/", status_code=status.HTTP_200_OK)
@@ -137,11 +246,12 @@ def close_overdue_tasks(db: Session = Depends(get_db)):
     
     from app.models.task import Task, TaskStatus
     from datetime import datetime
+    from sqlalchemy.orm import defer
     
     try:
         now = datetime.utcnow()
         
-        overdue_tasks = db.query(Task).filter(
+        overdue_tasks = db.query(Task).options(defer(Task.description)).filter(
             Task.deadline < now,
             Task.status != TaskStatus.DONE
         ).all()
@@ -0,0 +1,82 @@
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from app.api.admission import AdmissionControlMiddleware
+from app.api.idempotency import IdempotencyMiddleware
+from app.api.profiling import ProfilingMiddleware
+from app.api.single_flight import SingleFlightMiddleware
+from app.api.tracing import TracingMiddleware
+from config import Config
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.db.session import db_session
+    from app.jobs.autoclose import AutoCloseWorker
+    from app.jobs.worker import JobWorkerPool
+    from app.tracing.tracer import tracer
+    # Connections inherited from a parent process must never be reused in a worker
+    db_session.dispose(close=False)
+    job_workers = JobWorkerPool()
+    job_workers.start()
+    # Single-node deployments host auto-close here instead of a separate scheduler process
+    app.state.auto_close = AutoCloseWorker() if Config.API_AUTO_CLOSE_ENABLED else None
+    if app.state.auto_close:
+        app.state.auto_close.start()
+    yield
+    if app.state.auto_close:
+        await app.state.auto_close.stop(timeout=Config.API_GRACEFUL_SHUTDOWN_SECONDS)
+    job_workers.stop(timeout=Config.API_GRACEFUL_SHUTDOWN_SECONDS)
+    # Uvicorn has drained in-flight requests by now; release pooled connections
+    db_session.dispose()
+    tracer.shutdown()
+
+def create_app() -> FastAPI:
+    app = FastAPI(
+        title="ToDoList API",
+        version="1.0.0",
+        description="API for managing ToDoList projects and tasks",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        lifespan=lifespan
+    )
+    
+    # Innermost: only the endpoint of an admitted request is profiled
+    if Config.PROFILING_ENABLED:
+        app.add_middleware(ProfilingMiddleware)
+    # Added before admission control so it runs inside it
+    app.add_middleware(IdempotencyMiddleware)
+    if Config.ADMISSION_CONTROL_ENABLED:
+        app.add_middleware(AdmissionControlMiddleware)
+    # Outside admission control so waiting followers do not hold a slot
+    if Config.SINGLE_FLIGHT_ENABLED:
+        app.add_middleware(SingleFlightMiddleware)
+    # Outermost, so the server span includes time spent queued for admission
+    if Config.TRACING_ENABLED:
+        app.add_middleware(TracingMiddleware)
+    
+    # Import routers here to avoid circular imports at module level
+    from app.api.routers import api_router
+    app.include_router(api_router, prefix="/api/v1")
+    
+    @app.get("/")
+    def root():
+        return {
+            "message": "Welcome to ToDoList API",
+            "docs": "/docs",
+            "redoc": "/redoc",
+            "note": "CLI is deprecated. Use API endpoints instead."
+        }
+    
+    @app.get("/health")
+    def health_check(request: Request):
+        health = {"status": "healthy"}
+        auto_close = getattr(request.app.state, "auto_close", None)
+        if auto_close:
+            health["auto_close"] = auto_close.status()
+        return health
+    
+    @app.get("/health/statement-cache")
+    def statement_cache_stats():
+        from app.db.session import db_session
+        return db_session.statement_cache_info()
+    
+    return app
@@ -0,0 +1,24 @@
+from typing import List, Optional, Sequence
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[List[str]]:
+    """Parse a ?fields=a,b,c query value; None means the full representation."""
+    if not fields:
+        return None
+    
+    requested = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    if not requested:
+        raise HTTPException(status_code=400, detail="fields must name at least one field")
+    return requested
+
+def sparse_response(content) -> JSONResponse:
+    # Returned directly so the full response_model does not re-add the omitted keys
+    return JSONResponse(content=jsonable_encoder(content))
@@ -0,0 +1,112 @@
+import asyncio
+import hashlib
+import time
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response
+from app.db.session import db_session
+from app.models.idempotency_key import IdempotencyStatus
+from app.repositories.idempotency_repository import IdempotencyRepository
+from config import Config
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+
+# Write endpoints that honour the Idempotency-Key header
+IDEMPOTENT_ROUTES = {
+    ("POST", "/api/v1/projects"),
+    ("POST", "/api/v1/tasks"),
+    ("POST", "/api/v1/tasks/overdue/close"),
+}
+
+def _request_hash(method: str, path: str, body: bytes) -> str:
+    digest = hashlib.sha256()
+    digest.update(method.encode())
+    digest.update(path.encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+class IdempotencyMiddleware:
+    """Replays the stored response for a repeated Idempotency-Key instead of re-running the write.
+
+    A duplicate that arrives while the first request is still running waits for
+    it to finish. Server errors release the key so the client can retry for real.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or (scope["method"], scope["path"].rstrip("/")) not in IDEMPOTENT_ROUTES:
+            await self.app(scope, receive, send)
+            return
+
+        key = dict(scope["headers"]).get(IDEMPOTENCY_HEADER)
+        if not key:
+            await self.app(scope, receive, send)
+            return
+        key = key.decode("latin-1")
+
+        body_messages = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            body_messages.append(message)
+            more_body = message.get("more_body", False)
+        body = b"".join(message.get("body", b"") for message in body_messages)
+        request_hash = _request_hash(scope["method"], scope["path"].rstrip("/"), body)
+
+        repository = IdempotencyRepository(db_session.get_session())
+        try:
+            record = await run_in_threadpool(repository.claim, key, request_hash)
+            if record is None:
+                response = await self._stored_response(repository, key, request_hash)
+                await response(scope, receive, send)
+                return
+
+            async def replay_receive():
+                return body_messages.pop(0) if body_messages else await receive()
+
+            captured = {"status": 500, "body": []}
+
+            async def capture_send(message):
+                if message["type"] == "http.response.start":
+                    captured["status"] = message["status"]
+                elif message["type"] == "http.response.body":
+                    captured["body"].append(message.get("body", b""))
+                await send(message)
+
+            try:
+                await self.app(scope, replay_receive, capture_send)
+            except Exception:
+                await run_in_threadpool(repository.delete, key)
+                raise
+
+            if captured["status"] >= 500:
+                await run_in_threadpool(repository.delete, key)
+            else:
+                stored_body = b"".join(captured["body"]).decode("utf-8")
+                await run_in_threadpool(repository.complete, record, captured["status"], stored_body)
+        finally:
+            repository.session.close()
+
+    async def _stored_response(self, repository: IdempotencyRepository, key: str, request_hash: str) -> Response:
+        deadline = time.monotonic() + Config.IDEMPOTENCY_WAIT_SECONDS
+        while True:
+            record = await run_in_threadpool(repository.get_fresh, key)
+            if record is None or record.is_expired():
+                # The first attempt failed or the key aged out; let the client retry
+                return JSONResponse({"detail": "Previous request with this Idempotency-Key did not complete, retry"},
+                                    status_code=409)
+            if record.request_hash != request_hash:
+                return JSONResponse({"detail": "Idempotency-Key was already used for a different request"},
+                                    status_code=422)
+            if record.status == IdempotencyStatus.COMPLETED:
+                return Response(
+                    content=record.response_body,
+                    status_code=record.response_status,
+                    media_type="application/json",
+                    headers={"Idempotent-Replayed": "true"}
+                )
+            if time.monotonic() >= deadline:
+                return JSONResponse({"detail": "A request with this Idempotency-Key is still in progress"},
+                                    status_code=409, headers={"Retry-After": "1"})
+            await asyncio.sleep(Config.IDEMPOTENCY_POLL_INTERVAL_SECONDS)
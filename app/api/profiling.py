@@ -0,0 +1,98 @@
+from typing import Callable, Optional
+from urllib.parse import parse_qsl
+from fastapi import Header, HTTPException
+from fastapi.routing import APIRoute
+from starlette.responses import JSONResponse
+from app.profiling.profiler import (
+    PROFILE_EXTENSIONS,
+    RequestProfile,
+    is_authorized,
+    profile_context,
+    profiled,
+    rate_limiter,
+    reset_profile_context
+)
+from config import Config
+
+API_PREFIX = "/api/v1/"
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY = "profile"
+ADMIN_TOKEN_HEADER = b"x-admin-token"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+def requested_mode(scope) -> Optional[str]:
+    """Profile mode asked for with an X-Profile header or ?profile= flag, if any.
+
+    Only known modes count; any other value is left to the endpoint, which may
+    have a "profile" parameter of its own.
+    """
+    header = dict(scope["headers"]).get(PROFILE_HEADER)
+    if header:
+        mode = header.decode("latin-1").strip().lower()
+        return mode if mode in PROFILE_EXTENSIONS else None
+    for name, value in parse_qsl(scope.get("query_string", b"").decode("latin-1")):
+        if name == PROFILE_QUERY and value.strip().lower() in PROFILE_EXTENSIONS:
+            return value.strip().lower()
+    return None
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Dependency for the profiling admin endpoints; they do not exist unless profiling is enabled."""
+    if not Config.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not is_authorized(x_admin_token):
+        raise HTTPException(status_code=403, detail="A valid X-Admin-Token is required")
+
+class ProfiledRoute(APIRoute):
+    """Route whose endpoint runs under the request's profile, in the endpoint's own thread."""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, profiled(endpoint), **kwargs)
+
+class ProfilingMiddleware:
+    """Profiles single /api/v1 requests on demand for an admin.
+
+    A request carrying X-Profile (or ?profile=) with cpu, sample or memory and a
+    valid X-Admin-Token runs its endpoint under that profiler; the stored
+    profile's name comes back in X-Profile-Id. Profiles are rate limited per
+    process and never run concurrently; a refused request gets 429. With
+    PROFILING_ENABLED off every request passes through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        mode = None
+        if Config.PROFILING_ENABLED and scope["type"] == "http" and scope["path"].startswith(API_PREFIX):
+            mode = requested_mode(scope)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        token = dict(scope["headers"]).get(ADMIN_TOKEN_HEADER)
+        if not is_authorized(token.decode("latin-1") if token else None):
+            response = JSONResponse({"detail": "Profiling requires a valid X-Admin-Token"}, status_code=403)
+            await response(scope, receive, send)
+            return
+        if not rate_limiter.try_acquire():
+            response = JSONResponse(
+                {"detail": "Profiling rate limit reached or a profile is already running"},
+                status_code=429,
+                headers={"Retry-After": "60"}
+            )
+            await response(scope, receive, send)
+            return
+
+        profile = RequestProfile(mode, f"{scope['method']} {scope['path']}")
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start" and profile.saved:
+                message = {**message, "headers": [*message.get("headers", []), (PROFILE_ID_HEADER, profile.name.encode())]}
+            await send(message)
+
+        context_token = profile_context(profile)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            reset_profile_context(context_token)
+            rate_limiter.release()
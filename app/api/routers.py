@@ -1,7 +1,9 @@
 from fastapi import APIRouter
-from app.api.controllers import projects_controller, tasks_controller
+from app.api.controllers import admin_controller, projects_controller, tasks_controller, jobs_controller
 
 api_router = APIRouter()
 
 api_router.include_router(projects_controller.router)
 api_router.include_router(tasks_controller.router)
+api_router.include_router(jobs_controller.router)
+api_router.include_router(admin_controller.router)
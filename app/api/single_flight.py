@@ -0,0 +1,89 @@
+import asyncio
+import re
+from urllib.parse import parse_qsl, urlencode
+from app.api.profiling import requested_mode
+from config import Config
+
+# Read endpoints whose identical concurrent requests can share one execution
+_COALESCED_PATHS = re.compile(r"^/api/v1/(projects|tasks)(/[^/]+)*$")
+_STRONG_CONSISTENCY = b"strong"
+
+def request_key(scope) -> tuple:
+    query = sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True))
+    return scope["path"].rstrip("/"), urlencode(query)
+
+class SingleFlightMiddleware:
+    """Lets concurrent identical GETs share one in-flight execution and its response.
+
+    The first request for a key (path plus sorted query) runs normally while
+    copying its response; requests arriving before it finishes wait up to
+    SINGLE_FLIGHT_WAIT_SECONDS and replay that response. If the leader fails
+    with a server error or the wait times out, the follower runs on its own.
+    Requests asking for strong consistency are never coalesced, since the
+    shared execution may have started before their own write committed, and
+    neither are requests asking to be profiled.
+    """
+
+    def __init__(self, app, wait_timeout: float = None):
+        self.app = app
+        self.wait_timeout = wait_timeout if wait_timeout is not None else Config.SINGLE_FLIGHT_WAIT_SECONDS
+        self._in_flight = {}
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not _COALESCED_PATHS.match(scope["path"].rstrip("/"))
+            or dict(scope["headers"]).get(b"x-consistency", b"").lower() == _STRONG_CONSISTENCY
+            # A profiled request must run its own endpoint, and its X-Profile-Id is not shareable
+            or requested_mode(scope) is not None
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        key = request_key(scope)
+        leader = self._in_flight.get(key)
+        if leader is not None:
+            await self._follow(leader, scope, receive, send)
+            return
+
+        shared = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = shared
+        captured = {"status": 500, "headers": [], "body": []}
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                captured["body"].append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, capture_send)
+        finally:
+            if self._in_flight.get(key) is shared:
+                del self._in_flight[key]
+            # None tells followers to run the request themselves
+            response = None
+            if captured["status"] < 500 and not shared.cancelled():
+                response = (captured["status"], captured["headers"], b"".join(captured["body"]))
+            if not shared.done():
+                shared.set_result(response)
+
+    async def _follow(self, leader: asyncio.Future, scope, receive, send):
+        try:
+            response = await asyncio.wait_for(asyncio.shield(leader), self.wait_timeout)
+        except asyncio.TimeoutError:
+            response = None
+        if response is None:
+            await self.app(scope, receive, send)
+            return
+
+        status, headers, body = response
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": headers + [(b"x-coalesced", b"true")]
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,52 @@
+from app.tracing.tracer import SPAN_KIND_SERVER, STATUS_ERROR, parse_traceparent, tracer
+
+TRACEPARENT_HEADER = b"traceparent"
+
+def _route_template(path: str, route_path: str) -> str:
+    # Routes of an included router may report their path without the include prefix
+    static = route_path.split("{", 1)[0]
+    index = path.find(static)
+    return path[:index] + route_path if index > 0 else route_path
+
+class TracingMiddleware:
+    """Opens the server span for each request, continuing the caller's traceparent."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header = dict(scope["headers"]).get(TRACEPARENT_HEADER)
+        parent = parse_traceparent(header.decode("latin-1")) if header else None
+        status = {}
+
+        async def capture_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        with tracer.span(
+            f"{scope['method']} {scope['path']}",
+            SPAN_KIND_SERVER,
+            parent,
+            **{"http.method": scope["method"], "url.path": scope["path"]}
+        ) as span:
+            try:
+                await self.app(scope, receive, capture_status)
+            finally:
+                # Routing has resolved the controller by now; name the span after its route
+                route = scope.get("route")
+                if route is not None and getattr(route, "path", None):
+                    template = _route_template(scope["path"], route.path)
+                    span.name = f"{scope['method']} {template}"
+                    span.set_attribute("http.route", template)
+                endpoint = scope.get("endpoint")
+                if endpoint is not None:
+                    span.set_attribute("code.function", f"{endpoint.__module__}.{endpoint.__qualname__}")
+                if "code" in status:
+                    span.set_attribute("http.status_code", status["code"])
+                    if status["code"] >= 500:
+                        span.status = STATUS_ERROR
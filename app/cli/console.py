@@ -1,68 +1,116 @@
 import click
+import json
+import sys
 from datetime import datetime
 from app.services.project_service import ProjectService
 from app.services.task_service import TaskService
 from app.repositories.project_repository import ProjectRepository
 from app.repositories.task_repository import TaskRepository
 
+OUTPUT_FORMATS = ("detail", "table", "json")
+
+class BufferedWriter:
+    """Collects rendered rows and writes them to stdout in blocks instead of one print per line."""
+    
+    def __init__(self, stream=None, flush_every: int = 200):
+        self.stream = stream or sys.stdout
+        self.flush_every = flush_every
+        self._parts = []
+    
+    def write(self, text: str):
+        self._parts.append(text)
+        if len(self._parts) >= self.flush_every:
+            self.flush()
+    
+    def flush(self):
+        if self._parts:
+            self.stream.write("".join(self._parts))
+            self._parts = []
+        self.stream.flush()
+
 class CLICommands:
     def __init__(self, project_service: ProjectService, task_service: TaskService):
         self.project_service = project_service
         self.task_service = task_service
     
-    def display_project(self, project):
-        print(f"Name: {project.name}")
-        print(f"Description: {project.description}")
-        print(f"Created: {project.created_at.strftime('%Y-%m-%d %H:%M')}")
-        print(f"ID: {project.id}")
-        print(f"Tasks: {len(project.tasks) if project.tasks else 0}")
-        print("-" * 40)
+    def format_project(self, project, task_count: int) -> str:
+        return (
+            f"Name: {project.name}\n"
+            f"Description: {project.description}\n"
+            f"Created: {project.created_at.strftime('%Y-%m-%d %H:%M')}\n"
+            f"ID: {project.id}\n"
+            f"Tasks: {task_count}\n"
+            f"{'-' * 40}\n"
+        )
     
-    def display_task(self, task):
+    def format_task(self, task) -> str:
         status_icon = "✓" if task.status == "done" else "○" if task.status == "doing" else "✗"
         deadline = task.deadline.strftime("%Y-%m-%d") if task.deadline else "No deadline"
         closed_at = task.closed_at.strftime("%Y-%m-%d %H:%M") if task.closed_at else "Not closed"
         
-        print(f"[{status_icon}] {task.title}")
-        print(f"   Description: {task.description}")
-        print(f"   Status: {task.status}")
-        print(f"   Due: {deadline}")
-        print(f"   Created: {task.created_at.strftime('%Y-%m-%d %H:%M')}")
-        print(f"   Closed: {closed_at}")
-        print(f"   ID: {task.id}")
-        print("-" * 40)
+        return (
+            f"[{status_icon}] {task.title}\n"
+            f"   Description: {task.description}\n"
+            f"   Status: {task.status}\n"
+            f"   Due: {deadline}\n"
+            f"   Created: {task.created_at.strftime('%Y-%m-%d %H:%M')}\n"
+            f"   Closed: {closed_at}\n"
+            f"   ID: {task.id}\n"
+            f"{'-' * 40}\n"
+        )
+    
+    def display_project(self, project):
+        print(self.format_project(project, len(project.tasks) if project.tasks else 0), end="")
+    
+    def display_task(self, task):
+        print(self.format_task(task), end="")
     
     def create_project(self, name: str, description: str):
         success, message = self.project_service.create_project(name, description)
         print(message)
     
     def edit_project(self, project_name: str, new_name: str, description: str):
-        project = self.project_service.get_project_by_name(project_name)
-        if not project:
+        project_id = self.project_service.get_project_id_by_name(project_name)
+        if not project_id:
             print("Project not found")
             return
         
-        success, message = self.project_service.edit_project(project.id, new_name, description)
+        success, message = self.project_service.edit_project(project_id, new_name, description)
         print(message)
     
     def delete_project(self, project_name: str):
-        project = self.project_service.get_project_by_name(project_name)
-        if not project:
+        project_id = self.project_service.get_project_id_by_name(project_name)
+        if not project_id:
             print("Project not found")
             return
         
-        success, message = self.project_service.delete_project(project.id)
+        success, message = self.project_service.delete_project(project_id)
         print(message)
     
-    def list_projects(self):
-        projects = self.project_service.list_projects()
-        if not projects:
-            print("No projects found")
-            return
-        
-        print(f"\n=== Projects ({len(projects)}) ===")
-        for project in projects:
-            self.display_project(project)
+    def list_projects(self, output_format: str = "detail", limit: int = None, page: int = 1):
+        offset = (page - 1) * limit if limit else 0
+        # Built by hand because Project.to_dict() would load every task to count them
+        rows = (
+            (project, task_count, {
+                'id': project.id,
+                'name': project.name,
+                'description': project.description,
+                'created_at': project.created_at.isoformat() if project.created_at else None,
+                'tasks_count': task_count
+            })
+            for project, task_count in self.project_service.iter_projects(limit=limit, offset=offset)
+        )
+        self._render(
+            rows,
+            output_format,
+            title="=== Projects ===",
+            empty_message="No projects found",
+            table_header=f"{'ID':<36}  {'TASKS':>5}  {'CREATED':<16}  NAME",
+            table_row=lambda project, task_count: (
+                f"{project.id:<36}  {task_count:>5}  {project.created_at.strftime('%Y-%m-%d %H:%M'):<16}  {project.name}"
+            ),
+            detail_row=self.format_project
+        )
     
     def create_task(self, project_name: str, title: str, description: str, deadline: str = None):
         deadline_obj = None
@@ -88,39 +136,72 @@ class CLICommands:
         success, message = self.task_service.change_task_status(task_id, status)
         print(message)
     
-    def list_tasks(self, project_name: str = None):
+    def list_tasks(self, project_name: str = None, output_format: str = "detail", limit: int = None, page: int = 1):
+        offset = (page - 1) * limit if limit else 0
+        success, result = self.task_service.iter_tasks(project_name, limit=limit, offset=offset)
+        if not success:
+            print(result)
+            return
+        
         if project_name:
-            success, result = self.task_service.list_tasks_by_project(project_name)
-            if not success:
-                print(result)
-                return
-            
-            if not result:
-                print("No tasks found for this project")
-                return
-            
-            print(f"\n=== Tasks for Project: {project_name} ===")
-            for task in result:
-                self.display_task(task)
+            title = f"=== Tasks for Project: {project_name} ==="
+            empty_message = "No tasks found for this project"
         else:
-            tasks = self.task_service.list_all_tasks()
-            if not tasks:
-                print("No tasks found")
-                return
-            
-            print("\n=== All Tasks ===")
-            for task in tasks:
-                self.display_task(task)
-    
-    def show_overdue_tasks(self):
-        tasks = self.task_service.get_overdue_tasks()
-        if not tasks:
-            print("No overdue tasks found")
+            title = "=== All Tasks ==="
+            empty_message = "No tasks found"
+        self._render_tasks(result, output_format, title, empty_message)
+    
+    def show_overdue_tasks(self, output_format: str = "detail", limit: int = None, page: int = 1):
+        offset = (page - 1) * limit if limit else 0
+        tasks = self.task_service.iter_overdue_tasks(limit=limit, offset=offset)
+        self._render_tasks(tasks, output_format, "=== Overdue Tasks ===", "No overdue tasks found")
+    
+    def _render_tasks(self, tasks, output_format: str, title: str, empty_message: str):
+        self._render(
+            ((task, task.to_dict()) for task in tasks),
+            output_format,
+            title=title,
+            empty_message=empty_message,
+            table_header=f"{'ID':<36}  {'STATUS':<6}  {'DUE':<10}  TITLE",
+            table_row=lambda task: (
+                f"{task.id:<36}  {task.status:<6}  "
+                f"{task.deadline.strftime('%Y-%m-%d') if task.deadline else '-':<10}  {task.title}"
+            ),
+            detail_row=self.format_task
+        )
+    
+    def _render(self, rows, output_format: str, title: str, empty_message: str, table_header: str, table_row, detail_row):
+        """Stream rows as they arrive; each row is (*render_args, json_dict)."""
+        if output_format not in OUTPUT_FORMATS:
+            print(f"Unknown format '{output_format}'. Use one of: {', '.join(OUTPUT_FORMATS)}")
             return
         
-        print("\n=== Overdue Tasks ===")
-        for task in tasks:
-            self.display_task(task)
+        writer = BufferedWriter()
+        count = 0
+        for *render_args, as_dict in rows:
+            if count == 0:
+                if output_format == "json":
+                    writer.write("[\n")
+                else:
+                    writer.write(f"\n{title}\n")
+                    if output_format == "table":
+                        writer.write(table_header + "\n")
+            
+            if output_format == "json":
+                writer.write(("" if count == 0 else ",\n") + json.dumps(as_dict))
+            elif output_format == "table":
+                writer.write(table_row(*render_args) + "\n")
+            else:
+                writer.write(detail_row(*render_args))
+            count += 1
+        
+        if count == 0:
+            writer.write("[]\n" if output_format == "json" else f"{empty_message}\n")
+        elif output_format == "json":
+            writer.write("\n]\n")
+        else:
+            writer.write(f"({count} shown)\n")
+        writer.flush()
     
     def close_overdue_tasks(self):
         success, message = self.task_service.close_overdue_tasks()
@@ -0,0 +1,23 @@
+import click
+from app.services.task_service import TaskService
+from app.repositories.task_repository import TaskRepository
+from app.repositories.project_repository import ProjectRepository
+
+@click.command()
+@click.option('--days', type=int, default=None, help='Archive tasks closed more than this many days ago')
+def archive_closed(days):
+    click.echo("Starting archive of closed tasks...")
+    
+    try:
+        task_repository = TaskRepository()
+        project_repository = ProjectRepository()
+        task_service = TaskService(task_repository, project_repository)
+        
+        success, message = task_service.archive_closed_tasks(days)
+        click.echo(message)
+        
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
+if __name__ == "__main__":
+    archive_closed()
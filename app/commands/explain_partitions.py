@@ -0,0 +1,33 @@
+import click
+from app.db.partitions import explain_partitions as explain
+from app.repositories.task_repository import TaskRepository
+
+@click.command()
+@click.argument('method')
+@click.argument('args', nargs=-1)
+def explain_partitions(method, args):
+    """Show which tasks partitions a read-only TaskRepository query touches.
+    
+    Example: explain-partitions get_by_project_id <project_id>
+    """
+    if not method.startswith(("get_", "count_")):
+        click.echo("Only read-only repository methods (get_*, count_*) can be explained")
+        return
+    
+    task_repository = TaskRepository()
+    query_method = getattr(task_repository, method, None)
+    if query_method is None:
+        click.echo(f"TaskRepository has no method '{method}'")
+        return
+    
+    try:
+        for statement, relations in explain(query_method, *args):
+            click.echo(" ".join(statement.split()))
+            click.echo(f"  -> {', '.join(relations) if relations else 'no tasks relations'}")
+    except Exception as e:
+        click.echo(f"Error: {e}")
+    finally:
+        task_repository.session.close()
+
+if __name__ == "__main__":
+    explain_partitions()
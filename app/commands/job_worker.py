@@ -0,0 +1,22 @@
+import click
+import time
+from app.jobs.worker import JobWorkerPool
+
+@click.command()
+@click.option('--workers', type=int, default=None, help='Number of worker threads')
+def job_worker(workers):
+    pool = JobWorkerPool(workers=workers)
+    pool.start()
+    click.echo(f"Job worker started with {pool.workers} threads")
+    click.echo("Press Ctrl+C to stop")
+    
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        click.echo("\nStopping job worker...")
+        pool.stop()
+        click.echo("Job worker stopped")
+
+if __name__ == "__main__":
+    job_worker()
@@ -0,0 +1,23 @@
+import click
+from app.db.partitions import partition_tasks as partition, unpartition_tasks
+from config import Config
+
+@click.command()
+@click.option('--revert', is_flag=True, help='Move tasks back into a single unpartitioned table')
+def partition_tasks(revert):
+    """Hash-partition tasks by project_id into TASK_PARTITION_COUNT partitions (PostgreSQL).
+    
+    Opt-in and repeatable at any time, independent of the alembic revisions.
+    """
+    try:
+        if revert:
+            unpartition_tasks()
+            click.echo("tasks is a single table again; run with TASK_PARTITION_COUNT=0")
+        else:
+            partition(Config.TASK_PARTITION_COUNT)
+            click.echo(f"tasks is now split into {Config.TASK_PARTITION_COUNT} hash partitions")
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
+if __name__ == "__main__":
+    partition_tasks()
@@ -3,6 +3,10 @@ import time
 from app.services.task_service import TaskService
 from app.repositories.task_repository import TaskRepository
 from app.repositories.project_repository import ProjectRepository
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.db.session import db_session
+from app.db.sqlite import is_file_database
+from app.jobs.autoclose import run_autoclose_once
 from config import Config
 
 def run_scheduler():
@@ -13,6 +17,18 @@ def run_scheduler():
     schedule.every(interval_minutes).minutes.do(run_autoclose)
     
     print(f"Auto-close scheduled to run every {interval_minutes} minutes")
+    
+    if Config.TASK_ARCHIVE_RETENTION_DAYS > 0:
+        archive_hours = Config.TASK_ARCHIVE_INTERVAL_HOURS
+        schedule.every(archive_hours).hours.do(run_archive)
+        print(f"Archive of closed tasks scheduled to run every {archive_hours} hours")
+    schedule.every(1).hours.do(run_idempotency_sweep)
+    
+    maintenance_minutes = Config.SQLITE_MAINTENANCE_INTERVAL_MINUTES
+    if maintenance_minutes > 0 and is_file_database(db_session.database_url):
+        schedule.every(maintenance_minutes).minutes.do(run_sqlite_maintenance)
+        print(f"SQLite checkpoint/optimize scheduled to run every {maintenance_minutes} minutes")
+    
     print("Press Ctrl+C to stop the scheduler")
     
     try:
@@ -23,16 +39,44 @@ def run_scheduler():
         print("\nScheduler stopped")
 
 def run_autoclose():
+    try:
+        message = run_autoclose_once()
+        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}")
+        
+    except Exception as e:
+        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Error: {e}")
+
+def run_archive():
     try:
         task_repository = TaskRepository()
         project_repository = ProjectRepository()
         task_service = TaskService(task_repository, project_repository)
         
-        success, message = task_service.close_overdue_tasks()
+        success, message = task_service.archive_closed_tasks()
         print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}")
         
     except Exception as e:
         print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Error: {e}")
 
+def run_idempotency_sweep():
+    idempotency_repository = IdempotencyRepository()
+    try:
+        deleted_count = idempotency_repository.delete_expired()
+        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Removed {deleted_count} expired idempotency keys")
+        
+    except Exception as e:
+        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Error: {e}")
+    finally:
+        idempotency_repository.session.close()
+
+def run_sqlite_maintenance():
+    try:
+        result = db_session.run_sqlite_maintenance()
+        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] SQLite maintenance: checkpointed "
+              f"{result['checkpointed_frames']} of {result['wal_frames']} WAL frames")
+        
+    except Exception as e:
+        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] Error: {e}")
+
 if __name__ == "__main__":
     run_scheduler()
@@ -0,0 +1,32 @@
+import click
+from app.db.snapshot import restore_snapshot, write_snapshot
+
+@click.command()
+@click.argument('path')
+def snapshot(path):
+    """Dump projects, tasks and archived tasks into a columnar snapshot file."""
+    try:
+        counts = write_snapshot(path)
+        click.echo(
+            f"Wrote {counts['projects']} project(s), {counts['tasks']} task(s) and "
+            f"{counts['tasks_archive']} archived task(s) to {path}"
+        )
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
+@click.command()
+@click.argument('path')
+@click.option('--replace', is_flag=True, help='Delete existing projects, tasks and archived tasks before loading')
+def restore_snapshot_command(path, replace):
+    """Bulk-load projects, tasks and archived tasks from a snapshot file."""
+    try:
+        counts = restore_snapshot(path, replace=replace)
+        click.echo(
+            f"Restored {counts.get('projects', 0)} project(s), {counts.get('tasks', 0)} task(s) and "
+            f"{counts.get('tasks_archive', 0)} archived task(s) from {path}"
+        )
+    except Exception as e:
+        click.echo(f"Error: {e}")
+
+if __name__ == "__main__":
+    snapshot()
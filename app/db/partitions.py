@@ -0,0 +1,115 @@
+import re
+from typing import Callable, List, Tuple
+from sqlalchemy import event, text
+from app.db.session import db_session
+from app.models.task import Task
+
+_TASKS_RELATION = re.compile(r"\b(tasks(?:_p\d+)?)\b")
+
+def explain_partitions(query_callable: Callable, *args, **kwargs) -> List[Tuple[str, List[str]]]:
+    """Run a repository query and report which tasks relations its plans touch.
+    
+    Returns one (sql, relations) pair per statement executed. On PostgreSQL with
+    partitioning enabled the relations are partition names such as tasks_p3; on
+    SQLite they are just 'tasks', since there is nothing to prune.
+    """
+    engine = db_session.engine
+    captured = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+    
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        query_callable(*args, **kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    
+    explain = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    results = []
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        for statement, parameters in captured:
+            if not _TASKS_RELATION.search(statement):
+                continue
+            cursor.execute(explain + statement, parameters)
+            plan = " ".join(str(column) for row in cursor.fetchall() for column in row)
+            relations = sorted(set(_TASKS_RELATION.findall(plan)))
+            results.append((statement, relations))
+        cursor.close()
+    finally:
+        connection.close()
+    
+    return results
+
+def is_tasks_partitioned(connection) -> bool:
+    return connection.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('tasks'))"
+    )).scalar()
+
+def _create_task_indexes(connection):
+    # The LIKE copy carries no indexes; the model's are created on the new parent
+    # (and through it on every partition) once the old table and its names are gone
+    for index in Task.__table__.indexes:
+        index.create(connection, checkfirst=True)
+
+def partition_tasks(partitions: int, engine=None):
+    """Move tasks into a table hash-partitioned by project_id, in one transaction.
+    
+    PostgreSQL only. Rows are copied, so this takes an exclusive lock on tasks
+    for as long as the copy runs. The app must then run with
+    TASK_PARTITION_COUNT=partitions, since the primary key becomes (id, project_id).
+    """
+    engine = engine or db_session.engine
+    if engine.dialect.name != "postgresql":
+        raise ValueError("Partitioning is only supported on PostgreSQL")
+    if partitions < 1:
+        raise ValueError("Set TASK_PARTITION_COUNT to the number of partitions first")
+    
+    with engine.begin() as connection:
+        if is_tasks_partitioned(connection):
+            raise ValueError("tasks is already partitioned")
+        execute = lambda statement: connection.execute(text(statement))
+        execute("ALTER TABLE tasks RENAME TO tasks_unpartitioned")
+        execute("ALTER TABLE tasks_unpartitioned RENAME CONSTRAINT tasks_pkey TO tasks_unpartitioned_pkey")
+        execute("CREATE TABLE tasks (LIKE tasks_unpartitioned INCLUDING DEFAULTS) PARTITION BY HASH (project_id)")
+        execute("ALTER TABLE tasks ADD CONSTRAINT tasks_pkey PRIMARY KEY (id, project_id)")
+        execute(
+            "ALTER TABLE tasks ADD CONSTRAINT tasks_project_id_partitioned_fkey "
+            "FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE"
+        )
+        for remainder in range(partitions):
+            execute(
+                f"CREATE TABLE tasks_p{remainder} PARTITION OF tasks "
+                f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            )
+        # LIKE keeps the column order, so the rows copy over as they are
+        execute("INSERT INTO tasks SELECT * FROM tasks_unpartitioned")
+        execute("DROP TABLE tasks_unpartitioned")
+        _create_task_indexes(connection)
+        execute("ANALYZE tasks")
+
+def unpartition_tasks(engine=None):
+    """Undo partition_tasks: move every row back into a single tasks table."""
+    engine = engine or db_session.engine
+    if engine.dialect.name != "postgresql":
+        raise ValueError("Partitioning is only supported on PostgreSQL")
+    
+    with engine.begin() as connection:
+        if not is_tasks_partitioned(connection):
+            raise ValueError("tasks is not partitioned")
+        execute = lambda statement: connection.execute(text(statement))
+        execute("ALTER TABLE tasks RENAME TO tasks_partitioned")
+        execute("ALTER TABLE tasks_partitioned RENAME CONSTRAINT tasks_pkey TO tasks_partitioned_pkey")
+        execute("CREATE TABLE tasks (LIKE tasks_partitioned INCLUDING DEFAULTS)")
+        execute("ALTER TABLE tasks ADD CONSTRAINT tasks_pkey PRIMARY KEY (id)")
+        execute(
+            "ALTER TABLE tasks ADD CONSTRAINT tasks_project_id_fkey "
+            "FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE"
+        )
+        execute("INSERT INTO tasks SELECT * FROM tasks_partitioned")
+        # Dropping the parent drops every partition with it
+        execute("DROP TABLE tasks_partitioned")
+        _create_task_indexes(connection)
+        execute("ANALYZE tasks")
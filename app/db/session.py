@@ -1,38 +1,233 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import itertools
+import os
+import threading
+import time
+from typing import List, Optional
+from fastapi import Request
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql import Select
+from app.db.sqlite import apply_sqlite_profile, is_file_database, run_maintenance
 from config import Config
 
-class DatabaseSession:
+class _Replica:
+    def __init__(self, url: str, engine):
+        self.url = url
+        self.engine = engine
+        self.healthy = True
+        self.checked_at = 0.0
+
+class StatementCacheStats:
+    """Counts how each executed statement was served by the engines' compiled caches."""
+    
     def __init__(self):
-        self.database_url = Config.DATABASE_URL
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+        self._lock = threading.Lock()
+    
+    def record(self, cache_hit):
+        with self._lock:
+            if cache_hit is CACHE_HIT:
+                self.hits += 1
+            elif cache_hit is CACHE_MISS:
+                self.misses += 1
+            else:
+                self.uncached += 1
+    
+    def as_dict(self) -> dict:
+        with self._lock:
+            cached = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "uncached": self.uncached,
+                "hit_ratio": round(self.hits / cached, 4) if cached else None
+            }
+
+class RoutingSession(Session):
+    """Session that sends plain SELECTs to a replica until the first write.
+
+    Once anything is flushed or a DML statement runs, the session is pinned to
+    the primary for the rest of its life so the caller reads its own writes.
+    """
+
+    def __init__(self, *args, router: "DatabaseSession" = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.router = router
+        self.use_primary = router is None or not (router.replicas or router.sqlite_reader)
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.use_primary:
+            return self.router.engine if self.router else super().get_bind(mapper, clause, **kwargs)
+
+        if self._flushing or not isinstance(clause, Select):
+            self.use_primary = True
+            return self.router.engine
+
+        replica = self.router.next_replica()
+        if replica:
+            return replica.engine
+        return self.router.sqlite_reader or self.router.engine
+
+class DatabaseSession:
+    def __init__(self, database_url: Optional[str] = None, replica_urls: Optional[List[str]] = None):
+        self.database_url = database_url or Config.DATABASE_URL
         if not self.database_url:
             raise ValueError("DATABASE_URL environment variable is not set")
+
+        self.cache_stats = StatementCacheStats()
+        self.engine = self._create_engine(self.database_url)
+
+        if replica_urls is None:
+            replica_urls = Config.DATABASE_REPLICA_URLS
+        self.replicas = [_Replica(url, self._create_engine(url)) for url in replica_urls]
+        for replica in self.replicas:
+            self._watch_disconnects(replica)
+        self._replica_cycle = itertools.cycle(self.replicas) if self.replicas else None
+        self._replica_lock = threading.Lock()
         
-        # For SQLite, we need to add check_same_thread=False
-        if self.database_url.startswith('sqlite'):
-            self.engine = create_engine(self.database_url, connect_args={"check_same_thread": False})
-        else:
-            self.engine = create_engine(self.database_url)
-            
+        # Without replicas, a local SQLite file gets a pool of query_only connections
+        # for reads; under WAL they run alongside the writer instead of queueing
+        self.sqlite_reader = None
+        if (not self.replicas and Config.SQLITE_PROFILE_ENABLED and Config.SQLITE_READ_POOL_SIZE > 0
+                and is_file_database(self.database_url)):
+            self.sqlite_reader = self._create_engine(self.database_url, read_only=True)
+
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.ReadSessionLocal = sessionmaker(
+            class_=RoutingSession, router=self, autocommit=False, autoflush=False, bind=self.engine
+        )
+
+    def _create_engine(self, url: str, read_only: bool = False):
+        connect_args = {}
+        engine_args = {}
+        # For SQLite, we need to add check_same_thread=False
+        if url.startswith('sqlite'):
+            connect_args["check_same_thread"] = False
+            if read_only:
+                engine_args.update(pool_size=Config.SQLITE_READ_POOL_SIZE, max_overflow=0)
+        elif url.startswith('postgresql'):
+            if Config.DB_STATEMENT_TIMEOUT_MS > 0:
+                connect_args["options"] = f"-c statement_timeout={Config.DB_STATEMENT_TIMEOUT_MS}"
+            # Server-side prepared statements need psycopg 3; psycopg2 always sends plain SQL
+            if make_url(url).get_driver_name() == "psycopg" and Config.DB_PREPARE_THRESHOLD >= 0:
+                connect_args["prepare_threshold"] = Config.DB_PREPARE_THRESHOLD
+        
+        engine = create_engine(
+            url, connect_args=connect_args, query_cache_size=Config.DB_COMPILED_CACHE_SIZE, **engine_args
+        )
+        if url.startswith('sqlite') and Config.SQLITE_PROFILE_ENABLED:
+            apply_sqlite_profile(engine, read_only=read_only)
+        
+        @event.listens_for(engine, "before_cursor_execute")
+        def count_cache_use(conn, cursor, statement, parameters, context, executemany):
+            self.cache_stats.record(getattr(context, "cache_hit", None))
+        
+        if Config.TRACING_ENABLED:
+            from app.tracing.sql import instrument_engine
+            instrument_engine(engine)
+        return engine
+
+    def _watch_disconnects(self, replica: _Replica):
+        @event.listens_for(replica.engine, "handle_error")
+        def mark_unhealthy(context):
+            if context.is_disconnect:
+                replica.healthy = False
+                replica.checked_at = time.monotonic()
+
+    def _check_replica(self, replica: _Replica) -> bool:
+        replica.checked_at = time.monotonic()
+        try:
+            with replica.engine.connect() as connection:
+                connection.execute(select(1))
+            replica.healthy = True
+        except Exception:
+            replica.healthy = False
+        return replica.healthy
+
+    def next_replica(self) -> Optional[_Replica]:
+        """Round-robin over healthy replicas; None means fall back to the primary."""
+        if not self.replicas:
+            return None
+
+        now = time.monotonic()
+        for _ in range(len(self.replicas)):
+            with self._replica_lock:
+                replica = next(self._replica_cycle)
+            if now - replica.checked_at >= Config.REPLICA_HEALTH_CHECK_SECONDS:
+                self._check_replica(replica)
+            if replica.healthy:
+                return replica
+        return None
+
+    def statement_cache_info(self) -> dict:
+        compiled_cache = getattr(self.engine, "_compiled_cache", None)
+        return {
+            **self.cache_stats.as_dict(),
+            "size": len(compiled_cache) if compiled_cache is not None else 0,
+            "capacity": Config.DB_COMPILED_CACHE_SIZE
+        }
     
-    def get_session(self):
-        return self.SessionLocal()
+    def dispose(self, close: bool = True):
+        """Drop pooled connections; close=False only forgets ones inherited across fork."""
+        self.engine.dispose(close=close)
+        if self.sqlite_reader is not None:
+            self.sqlite_reader.dispose(close=close)
+        for replica in self.replicas:
+            replica.engine.dispose(close=close)
+
+    def run_sqlite_maintenance(self) -> Optional[dict]:
+        """WAL checkpoint and PRAGMA optimize on the primary; None for other databases."""
+        if not is_file_database(self.database_url):
+            return None
+        return run_maintenance(self.engine)
     
+    def get_session(self, expire_on_commit: bool = True):
+        return self.SessionLocal(expire_on_commit=expire_on_commit)
+
+    def get_read_session(self):
+        return self.ReadSessionLocal()
+
     def create_tables(self):
         from app.db.base import Base
+        import app.models
         Base.metadata.create_all(bind=self.engine)
+        # SQLite replicas are local stand-ins with no replication, so give them the schema too
+        for replica in self.replicas:
+            if replica.url.startswith('sqlite'):
+                Base.metadata.create_all(bind=replica.engine)
 
 # Global database session instance
 db_session = DatabaseSession()
 
+# The instance is created at import time, possibly before a server forks workers
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: db_session.dispose(close=False))
+
 # Dependency for FastAPI
 def get_db():
     """
     FastAPI dependency that provides a database session.
     Usage in endpoint: db: Session = Depends(get_db)
     """
-    db = db_session.get_session()
+    # Request-scoped: objects returned after commit are serialized as-is, not reloaded
+    db = db_session.get_session(expire_on_commit=False)
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_read_db(request: Request):
+    """
+    FastAPI dependency for read-only endpoints; queries go to a replica when configured.
+    Clients that need to see their own recent writes send "X-Consistency: strong".
+    """
+    db = db_session.get_read_session()
+    if request.headers.get("X-Consistency", "").lower() == "strong":
+        db.use_primary = True
     try:
         yield db
     finally:
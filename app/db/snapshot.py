@@ -0,0 +1,386 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import uuid
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import delete, func, insert, select
+from app.db.session import db_session
+from app.models.project import Project
+from app.models.task import Task
+from app.models.task_archive import TaskArchive
+from config import Config
+
+SNAPSHOT_MAGIC = b"TDLSNAP1"
+SNAPSHOT_VERSION = 1
+
+# Timestamps are int64 microseconds since the Unix epoch (naive UTC, like the models)
+NULL_TIMESTAMP = -(2 ** 63)
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+_HEADER = struct.Struct("<8sQ")
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+# Tables in restore order (projects before the tasks that reference them) and each column's encoding;
+# the archive is included because deleting projects on replace cascades into it
+SNAPSHOT_TABLES = {
+    "projects": (Project.__table__, {
+        "id": "uuid",
+        "name": "string",
+        "description": "string",
+        "created_at": "timestamp",
+        "version": "int64",
+    }),
+    "tasks": (Task.__table__, {
+        "id": "uuid",
+        "project_id": "uuid",
+        "title": "string",
+        "description": "string",
+        "status": "dictionary",
+        "deadline": "timestamp",
+        "created_at": "timestamp",
+        "closed_at": "timestamp",
+        "version": "int64",
+    }),
+    "tasks_archive": (TaskArchive.__table__, {
+        "id": "uuid",
+        "project_id": "uuid",
+        "title": "string",
+        "description": "string",
+        "status": "dictionary",
+        "deadline": "timestamp",
+        "created_at": "timestamp",
+        "closed_at": "timestamp",
+        "version": "int64",
+        "archived_at": "timestamp",
+    }),
+}
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+def _le_bytes(values: array) -> bytes:
+    if not _LITTLE_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+class _UuidBuilder:
+    def __init__(self):
+        self.data = bytearray()
+
+    def append(self, value):
+        self.data += uuid.UUID(str(value)).bytes
+
+    def finish(self) -> tuple:
+        return {}, {"data": bytes(self.data)}
+
+class _StringBuilder:
+    def __init__(self):
+        self.offsets = array("q", [0])
+        self.heap = bytearray()
+        self.valid = bytearray()
+
+    def append(self, value):
+        if value is not None:
+            self.heap += value.encode("utf-8")
+        self.valid.append(value is not None)
+        self.offsets.append(len(self.heap))
+
+    def finish(self) -> tuple:
+        return {}, {"offsets": _le_bytes(self.offsets), "heap": bytes(self.heap), "valid": bytes(self.valid)}
+
+class _TimestampBuilder:
+    def __init__(self):
+        self.values = array("q")
+
+    def append(self, value):
+        self.values.append(NULL_TIMESTAMP if value is None else (value - _EPOCH) // _MICROSECOND)
+
+    def finish(self) -> tuple:
+        return {}, {"values": _le_bytes(self.values)}
+
+class _Int64Builder:
+    def __init__(self):
+        self.values = array("q")
+
+    def append(self, value):
+        self.values.append(value)
+
+    def finish(self) -> tuple:
+        return {}, {"values": _le_bytes(self.values)}
+
+class _DictionaryBuilder:
+    def __init__(self):
+        self.codes = bytearray()
+        self.values = {}
+
+    def append(self, value):
+        code = self.values.setdefault(value, len(self.values))
+        if code > 255:
+            raise ValueError("Dictionary-encoded columns support at most 256 distinct values")
+        self.codes.append(code)
+
+    def finish(self) -> tuple:
+        return {"values": list(self.values)}, {"codes": bytes(self.codes)}
+
+_BUILDERS = {
+    "uuid": _UuidBuilder,
+    "string": _StringBuilder,
+    "timestamp": _TimestampBuilder,
+    "int64": _Int64Builder,
+    "dictionary": _DictionaryBuilder,
+}
+
+def write_snapshot(path: str, engine=None) -> Dict[str, int]:
+    """Dump every SNAPSHOT_TABLES table into one columnar file; returns row counts.
+
+    Layout: magic, header length, JSON header, then 8-byte aligned column
+    buffers. The header records each buffer's (offset, length) relative to the
+    start of the buffer section.
+    """
+    engine = engine or db_session.engine
+    options = {"isolation_level": "REPEATABLE READ"} if engine.dialect.name == "postgresql" else {}
+
+    tables = {}
+    buffers = []
+    position = 0
+    with engine.connect().execution_options(**options) as connection, connection.begin():
+        for name, (table, encodings) in SNAPSHOT_TABLES.items():
+            builders = {column: _BUILDERS[encoding]() for column, encoding in encodings.items()}
+            columns = [table.c[column] for column in encodings]
+            result = connection.execution_options(yield_per=Config.STREAM_CHUNK_SIZE).execute(
+                select(*columns).order_by(table.c.created_at)
+            )
+            rows = 0
+            for row in result:
+                for builder, value in zip(builders.values(), row):
+                    builder.append(value)
+                rows += 1
+
+            column_meta = {}
+            for column, builder in builders.items():
+                meta, column_buffers = builder.finish()
+                meta["encoding"] = encodings[column]
+                meta["buffers"] = {}
+                for buffer_name, data in column_buffers.items():
+                    position = _align(position)
+                    meta["buffers"][buffer_name] = [position, len(data)]
+                    buffers.append((position, data))
+                    position += len(data)
+                column_meta[column] = meta
+            tables[name] = {"rows": rows, "columns": column_meta}
+
+    header = json.dumps({
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.utcnow().isoformat(),
+        "tables": tables
+    }).encode("utf-8")
+    data_start = _align(_HEADER.size + len(header))
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, len(header)))
+        f.write(header)
+        for offset, data in buffers:
+            f.seek(data_start + offset)
+            f.write(data)
+        f.truncate(data_start + position)
+    os.replace(temporary_path, path)
+    return {name: meta["rows"] for name, meta in tables.items()}
+
+class UuidColumn:
+    def __init__(self, data: memoryview):
+        self.data = data
+
+    def __len__(self):
+        return len(self.data) // 16
+
+    def __getitem__(self, index: int) -> uuid.UUID:
+        # CompactUUID binds uuid.UUID directly, so restores skip the string round trip
+        start = index * 16
+        return uuid.UUID(bytes=bytes(self.data[start:start + 16]))
+
+class StringColumn:
+    """UTF-8 strings as int64 offsets into one heap; rows are decoded only when indexed."""
+
+    def __init__(self, offsets: memoryview, heap: memoryview, valid: memoryview):
+        self.offsets = offsets
+        self.heap = heap
+        self.valid = valid
+
+    def __len__(self):
+        return len(self.valid)
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        if not self.valid[index]:
+            return None
+        return str(self.heap[self.offsets[index]:self.offsets[index + 1]], "utf-8")
+
+class TimestampColumn:
+    def __init__(self, values: memoryview):
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> Optional[datetime]:
+        value = self.values[index]
+        return None if value == NULL_TIMESTAMP else _EPOCH + timedelta(microseconds=value)
+
+class Int64Column:
+    def __init__(self, values: memoryview):
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> int:
+        return self.values[index]
+
+class DictionaryColumn:
+    def __init__(self, codes: memoryview, values: List):
+        self.codes = codes
+        self.values = values
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index: int):
+        return self.values[self.codes[index]]
+
+class SnapshotTable:
+    def __init__(self, snapshot: "Snapshot", name: str, meta: dict):
+        self.snapshot = snapshot
+        self.name = name
+        self.rows = meta["rows"]
+        self._columns = meta["columns"]
+
+    @property
+    def column_names(self) -> List[str]:
+        return list(self._columns)
+
+    def column(self, name: str):
+        meta = self._columns[name]
+        buffer = lambda buffer_name, fmt="B": self.snapshot._buffer(meta["buffers"][buffer_name], fmt)
+        encoding = meta["encoding"]
+        if encoding == "uuid":
+            return UuidColumn(buffer("data"))
+        if encoding == "string":
+            return StringColumn(buffer("offsets", "q"), buffer("heap"), buffer("valid"))
+        if encoding == "timestamp":
+            return TimestampColumn(buffer("values", "q"))
+        if encoding == "int64":
+            return Int64Column(buffer("values", "q"))
+        if encoding == "dictionary":
+            return DictionaryColumn(buffer("codes"), meta["values"])
+        raise ValueError(f"Unknown column encoding '{encoding}'")
+
+    def iter_rows(self) -> Iterator[dict]:
+        columns = {name: self.column(name) for name in self._columns}
+        for index in range(self.rows):
+            yield {name: column[index] for name, column in columns.items()}
+
+class Snapshot:
+    """Read-only, memory-mapped view of a snapshot file.
+
+    Column buffers are memoryviews straight into the mapping (int64 columns are
+    cast to 'q'), so analytics code can wrap them, e.g. with numpy.frombuffer,
+    without copying. Views handed out become invalid once the snapshot is closed.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is not a snapshot file")
+        self._views = []
+
+        magic, header_length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a snapshot file")
+        header = json.loads(self._mmap[_HEADER.size:_HEADER.size + header_length])
+        if header["version"] != SNAPSHOT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported snapshot version {header['version']}")
+
+        self.created_at = header["created_at"]
+        self._data_start = _align(_HEADER.size + header_length)
+        self.tables = {name: SnapshotTable(self, name, meta) for name, meta in header["tables"].items()}
+
+    def __getitem__(self, name: str) -> SnapshotTable:
+        return self.tables[name]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _buffer(self, location: List[int], fmt: str) -> memoryview:
+        offset, length = location
+        start = self._data_start + offset
+        view = memoryview(self._mmap)[start:start + length]
+        self._views.append(view)
+        if fmt == "B":
+            return view
+        if not _LITTLE_ENDIAN:
+            # The file is little-endian; big-endian hosts get a swapped copy instead of a view
+            values = array(fmt, view.tobytes())
+            values.byteswap()
+            return memoryview(values)
+        cast = view.cast(fmt)
+        self._views.append(cast)
+        return cast
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mmap.close()
+        self._file.close()
+
+def restore_snapshot(path: str, replace: bool = False, engine=None, chunk_size: Optional[int] = None) -> Dict[str, int]:
+    """Bulk-load a snapshot in one transaction with multi-row INSERTs; returns row counts.
+
+    The target tables must be empty unless replace=True, which deletes existing
+    rows first, children before parents. Replacing is refused when the snapshot
+    lacks a table that has rows, e.g. an archive in a snapshot taken without it.
+    """
+    engine = engine or db_session.engine
+    chunk_size = chunk_size or Config.BULK_OPERATION_CHUNK_SIZE
+    counts = {}
+
+    with Snapshot(path) as snapshot, engine.begin() as connection:
+        if replace:
+            for name, (table, _) in SNAPSHOT_TABLES.items():
+                if name not in snapshot.tables and connection.execute(select(func.count()).select_from(table)).scalar():
+                    raise ValueError(f"Snapshot has no '{name}' table; replacing would lose its rows")
+            for table, _ in reversed(list(SNAPSHOT_TABLES.values())):
+                connection.execute(delete(table))
+        else:
+            for name, (table, _) in SNAPSHOT_TABLES.items():
+                if connection.execute(select(func.count()).select_from(table)).scalar():
+                    raise ValueError(f"Table '{name}' is not empty; restore with replace to overwrite it")
+
+        for name, (table, _) in SNAPSHOT_TABLES.items():
+            if name not in snapshot.tables:
+                continue
+            chunk = []
+            for row in snapshot[name].iter_rows():
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    connection.execute(insert(table), chunk)
+                    chunk = []
+            if chunk:
+                connection.execute(insert(table), chunk)
+            counts[name] = snapshot[name].rows
+
+    return counts
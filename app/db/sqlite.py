@@ -0,0 +1,93 @@
+import re
+import threading
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from config import Config
+
+# Statements that need SQLite's single write lock
+_WRITE_STATEMENT = re.compile(r"\s*(INSERT|UPDATE|DELETE|REPLACE|CREATE|DROP|ALTER)\b", re.IGNORECASE)
+_WRITER_KEY = "sqlite_writer_lock"
+
+def is_file_database(url: str) -> bool:
+    """True for on-disk SQLite URLs; in-memory databases cannot use WAL or a second pool."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return False
+    return parsed.database not in (None, "", ":memory:") and parsed.query.get("mode") != "memory"
+
+class WriterLock:
+    """Serializes write transactions of one process before they reach SQLite.
+
+    SQLite allows a single writer at a time; without this, waiting writers spin
+    in SQLite's busy handler with growing sleeps. Here they queue on a lock that
+    is taken by the first write statement of a transaction and released on
+    commit, rollback or when the connection goes back to the pool. A writer that
+    cannot get it within the busy timeout proceeds and leaves the wait to SQLite.
+    """
+
+    def __init__(self, timeout_seconds: float):
+        self.timeout = timeout_seconds
+        self._lock = threading.Lock()
+
+    def acquire(self, info: dict):
+        if not info.get(_WRITER_KEY) and self._lock.acquire(timeout=self.timeout):
+            info[_WRITER_KEY] = True
+
+    def release(self, info: dict):
+        if info.pop(_WRITER_KEY, False):
+            self._lock.release()
+
+def _set_pragmas(dbapi_connection, read_only: bool):
+    cursor = dbapi_connection.cursor()
+    try:
+        # busy_timeout first, so switching the journal mode can wait for other processes
+        cursor.execute(f"PRAGMA busy_timeout = {Config.SQLITE_BUSY_TIMEOUT_MS}")
+        # Readers run alongside the writer; commits append to the WAL and fsync only at checkpoints
+        cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute("PRAGMA synchronous = NORMAL")
+        cursor.execute(f"PRAGMA mmap_size = {Config.SQLITE_MMAP_SIZE_MB * 1024 * 1024}")
+        # Negative cache_size is in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size = -{Config.SQLITE_CACHE_SIZE_KB}")
+        cursor.execute("PRAGMA temp_store = MEMORY")
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+    finally:
+        cursor.close()
+
+def apply_sqlite_profile(engine, read_only: bool = False):
+    """Set the production pragmas on every new connection of a SQLite engine."""
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        _set_pragmas(dbapi_connection, read_only)
+
+    if read_only or not is_file_database(str(engine.url)):
+        return
+
+    writer_lock = WriterLock(Config.SQLITE_BUSY_TIMEOUT_MS / 1000)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def take_writer_lock(conn, cursor, statement, parameters, context, executemany):
+        if _WRITE_STATEMENT.match(statement):
+            writer_lock.acquire(conn.info)
+
+    @event.listens_for(engine, "commit")
+    def release_on_commit(conn):
+        writer_lock.release(conn.info)
+
+    @event.listens_for(engine, "rollback")
+    def release_on_rollback(conn):
+        writer_lock.release(conn.info)
+
+    @event.listens_for(engine, "checkin")
+    def release_on_checkin(dbapi_connection, connection_record):
+        # Covers autocommit DDL and connections returned without ending the transaction
+        if connection_record is not None:
+            writer_lock.release(connection_record.info)
+
+def run_maintenance(engine) -> dict:
+    """Checkpoint the WAL back into the database file and refresh planner statistics."""
+    with engine.connect() as connection:
+        busy, wal_frames, checkpointed = connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").one()
+        connection.exec_driver_sql("PRAGMA optimize")
+    return {"busy": bool(busy), "wal_frames": wal_frames, "checkpointed_frames": checkpointed}
@@ -0,0 +1,52 @@
+import os
+import time
+import uuid
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (RFC 9562 version 7): 48-bit millisecond timestamp, then random bits."""
+    timestamp_ms = time.time_ns() // 1_000_000
+    random_bits = int.from_bytes(os.urandom(10), "big")
+    
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76
+    value |= ((random_bits >> 62) & 0xFFF) << 64
+    value |= 0b10 << 62
+    value |= random_bits & ((1 << 62) - 1)
+    return uuid.UUID(int=value)
+
+def new_id() -> str:
+    return str(uuid7())
+
+class CompactUUID(TypeDecorator):
+    """UUID primary/foreign key stored natively on PostgreSQL and as 16 raw bytes elsewhere.
+    
+    Python code keeps seeing the canonical 36-character string, so the API and
+    CLI are unaffected by the storage format.
+    """
+    impl = LargeBinary(16)
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=True))
+        return dialect.type_descriptor(LargeBinary(16))
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, uuid.UUID):
+            try:
+                value = uuid.UUID(str(value))
+            except ValueError:
+                # A malformed id can never match a row; bind NULL instead of failing the query
+                return None
+        return value if dialect.name == "postgresql" else value.bytes
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        return str(uuid.UUID(bytes=bytes(value)))
@@ -15,4 +15,8 @@ class DuplicateTaskException(TodoListException):
 class LimitExceededException(TodoListException):
     pass
 
+class JobNotFoundException(TodoListException):
+    pass
 
+class VersionConflictException(TodoListException):
+    pass
@@ -0,0 +1,90 @@
+import asyncio
+import traceback
+from datetime import datetime, timedelta
+from typing import Optional
+from starlette.concurrency import run_in_threadpool
+from app.db.session import db_session
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.task_repository import TaskRepository
+from app.services.task_service import TaskService
+from app.tracing.tracer import tracer
+from config import Config
+
+def run_autoclose_once() -> str:
+    """Close overdue tasks with a session of its own, closed again before returning."""
+    session = db_session.get_session()
+    try:
+        with tracer.span("scheduler.run_autoclose"):
+            task_service = TaskService(TaskRepository(session), ProjectRepository(session))
+            success, message = task_service.close_overdue_tasks()
+        if not success:
+            raise RuntimeError(message)
+        return message
+    finally:
+        session.close()
+
+class AutoCloseWorker:
+    """Asyncio task that runs auto-close every interval inside the API process.
+
+    The database work runs in the thread pool so the event loop keeps serving
+    requests. The first run happens at startup; stop() lets a run in progress
+    finish (up to a timeout) instead of cancelling it halfway.
+    """
+
+    def __init__(self, interval_minutes: Optional[int] = None):
+        minutes = interval_minutes if interval_minutes is not None else Config.AUTO_CLOSE_INTERVAL_MINUTES
+        self.interval = timedelta(minutes=minutes)
+        self.last_run_at: Optional[datetime] = None
+        self.last_result: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.next_run_at: Optional[datetime] = None
+        self.running = False
+        self._stop: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="auto-close")
+
+    async def stop(self, timeout: Optional[float] = None):
+        if self._task is None:
+            return
+        self._stop.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            # wait_for has cancelled the task; the thread finishes its run and closes its session
+            pass
+        self._task = None
+        self.next_run_at = None
+
+    async def _run(self):
+        while not self._stop.is_set():
+            await self._run_once()
+            self.next_run_at = datetime.utcnow() + self.interval
+            try:
+                await asyncio.wait_for(self._stop.wait(), self.interval.total_seconds())
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_once(self):
+        self.running = True
+        try:
+            self.last_result = await run_in_threadpool(run_autoclose_once)
+            self.last_error = None
+        except Exception as e:
+            traceback.print_exc()
+            self.last_error = str(e)
+        finally:
+            self.running = False
+            self.last_run_at = datetime.utcnow()
+
+    def status(self) -> dict:
+        return {
+            "interval_minutes": int(self.interval.total_seconds() // 60),
+            "running": self.running,
+            "last_run_at": self.last_run_at,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+            "next_run_at": self.next_run_at
+        }
@@ -0,0 +1,26 @@
+from typing import Callable, Dict
+from app.db.session import db_session
+from app.models.job import JobType
+from app.repositories.project_repository import ProjectRepository
+from app.exceptions.repository_exceptions import ProjectNotFoundException
+
+# handler(payload, progress) -> result dict; progress(processed, total) persists job progress
+JobHandler = Callable[[dict, Callable[[int, int], None]], dict]
+
+def delete_project(payload: dict, progress: Callable[[int, int], None]) -> dict:
+    project_repository = ProjectRepository(db_session.get_session())
+    try:
+        project_repository.delete(payload["project_id"], progress=progress)
+        return {"project_id": payload["project_id"], "deleted": True}
+    except ProjectNotFoundException:
+        # Already gone (e.g. deleted by an earlier attempt); nothing left to do
+        return {"project_id": payload["project_id"], "deleted": False}
+    finally:
+        project_repository.session.close()
+
+JOB_HANDLERS: Dict[str, JobHandler] = {
+    JobType.DELETE_PROJECT: delete_project,
+}
+
+def register_job_handler(job_type: str, handler: JobHandler):
+    JOB_HANDLERS[job_type] = handler
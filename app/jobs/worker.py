@@ -0,0 +1,138 @@
+import json
+import threading
+import time
+import traceback
+from datetime import datetime
+from typing import List, Optional
+from app.db.session import db_session
+from app.jobs.handlers import JOB_HANDLERS
+from app.repositories.job_repository import JobRepository
+from config import Config
+
+class _Heartbeat:
+    """Renews a claimed job's lease on its own session while the handler runs."""
+    
+    def __init__(self, job_id: str, started_at: datetime, interval_seconds: float):
+        # Plain values: the worker's Job instance belongs to its session and thread
+        self.job_id = job_id
+        self.started_at = started_at
+        self.interval = interval_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"job-heartbeat-{job_id}", daemon=True)
+    
+    def start(self):
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            job_repository = JobRepository(db_session.get_session())
+            try:
+                if not job_repository.renew_lease(self.job_id, self.started_at):
+                    return
+            except Exception:
+                traceback.print_exc()
+            finally:
+                job_repository.session.close()
+
+class JobWorkerPool:
+    """Threads that poll the jobs table, claim queued jobs and run their handlers.
+
+    Running jobs hold a lease, renewed by their progress reports and by a
+    heartbeat thread while the handler runs. At startup and then once per
+    lease, jobs whose lease ran out are put back in the queue. A worker whose
+    job was re-queued meanwhile cannot finish it; its result is dropped.
+    """
+    
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[int] = None
+    ):
+        self.workers = workers if workers is not None else Config.JOB_WORKERS
+        self.poll_interval = poll_interval if poll_interval is not None else Config.JOB_POLL_INTERVAL_SECONDS
+        self.lease_seconds = lease_seconds if lease_seconds is not None else Config.JOB_LEASE_SECONDS
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._next_requeue_at = 0.0
+        self._requeue_lock = threading.Lock()
+    
+    def start(self):
+        self._stop.clear()
+        self._next_requeue_at = 0.0
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+    
+    def stop(self, timeout: Optional[float] = None):
+        # Running jobs finish their current chunk loop; nothing new is claimed
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+    
+    def requeue_stale(self) -> int:
+        job_repository = JobRepository(db_session.get_session())
+        try:
+            return job_repository.requeue_stale(self.lease_seconds)
+        finally:
+            job_repository.session.close()
+    
+    def _requeue_due(self) -> bool:
+        with self._requeue_lock:
+            now = time.monotonic()
+            if now < self._next_requeue_at:
+                return False
+            self._next_requeue_at = now + self.lease_seconds
+            return True
+    
+    def run_once(self) -> bool:
+        if self._requeue_due():
+            self.requeue_stale()
+        job_repository = JobRepository(db_session.get_session())
+        try:
+            job = job_repository.claim_next()
+            if job is None:
+                return False
+            
+            handler = JOB_HANDLERS.get(job.type)
+            if handler is None:
+                job_repository.finish(job, error=f"No handler for job type '{job.type}'")
+                return True
+            
+            def progress(processed: int, total: int):
+                job_repository.report_progress(job, processed, total)
+            
+            heartbeat = _Heartbeat(job.id, job.started_at, self.lease_seconds / 3)
+            heartbeat.start()
+            try:
+                result = handler(json.loads(job.payload), progress)
+            except Exception as e:
+                traceback.print_exc()
+                job_repository.session.rollback()
+                result, error = None, str(e)
+            else:
+                error = None
+            finally:
+                heartbeat.stop()
+            
+            if not job_repository.finish(job, result=result, error=error):
+                print(f"Job {job.id} was re-queued while running; dropping this run's result")
+            return True
+        finally:
+            job_repository.session.close()
+    
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                worked = self.run_once()
+            except Exception:
+                traceback.print_exc()
+                worked = False
+            if not worked:
+                self._stop.wait(self.poll_interval)
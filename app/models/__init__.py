@@ -1 +1,2 @@
-
+# Importing every model registers its table on Base.metadata (create_tables, alembic)
+from app.models import project, task, task_archive, idempotency_key, job
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, DateTime, Text, Integer
+from datetime import datetime
+from app.db.base import Base
+
+class IdempotencyStatus:
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status = Column(String(16), nullable=False, default=IdempotencyStatus.IN_PROGRESS)
+    response_status = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<IdempotencyKey(key='{self.key}', status='{self.status}')>"
+    
+    def is_expired(self):
+        return datetime.utcnow() >= self.expires_at
@@ -0,0 +1,51 @@
+from sqlalchemy import Column, String, DateTime, Text, Integer
+from datetime import datetime
+import json
+from app.db.base import Base
+from app.db.types import CompactUUID, new_id
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class JobType:
+    DELETE_PROJECT = "delete_project"
+
+class Job(Base):
+    __tablename__ = "jobs"
+    
+    id = Column(CompactUUID, primary_key=True, default=new_id)
+    type = Column(String(50), nullable=False)
+    status = Column(String(16), nullable=False, default=JobStatus.QUEUED, index=True)
+    # Set while queued/running so the same work is not enqueued twice
+    dedupe_key = Column(String(255), nullable=True, index=True)
+    payload = Column(Text, nullable=False, default="{}")
+    processed = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=True)
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    # Renewed on claim and every progress report; a stale one means the worker is gone
+    heartbeat_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<Job(id={self.id}, type='{self.type}', status='{self.status}')>"
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'type': self.type,
+            'status': self.status,
+            'payload': json.loads(self.payload) if self.payload else {},
+            'processed': self.processed,
+            'total': self.total,
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
@@ -1,19 +1,33 @@
-from sqlalchemy import Column, String, DateTime, Text
+from sqlalchemy import Column, String, DateTime, Text, Integer, Index, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
-import uuid
 from app.db.base import Base
+from app.db.types import CompactUUID, new_id
 
 class Project(Base):
     __tablename__ = "projects"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(CompactUUID, primary_key=True, default=new_id)
     name = Column(String(255), nullable=False, unique=True)
     description = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped by every write; ORM flushes and versioned updates fail on a stale value
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     
-    # Relationship with tasks
-    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
+    # Relationship with tasks; deleting a project never loads them; ProjectRepository.delete
+    # removes them in chunks and ON DELETE CASCADE covers anything left
+    tasks = relationship(
+        "Task", back_populates="project", cascade="all, delete-orphan", passive_deletes=True,
+        order_by="Task.created_at"
+    )
+    
+    __mapper_args__ = {"version_id_col": version}
+    
+    # Case-insensitive prefix lookups for typeahead; text_pattern_ops lets PostgreSQL use it for LIKE 'abc%'
+    __table_args__ = (
+        Index("ix_projects_name_lower", func.lower(name).label("name_lower"),
+              postgresql_ops={"name_lower": "text_pattern_ops"}),
+    )
     
     def __repr__(self):
         return f"<Project(id={self.id}, name='{self.name}')>"
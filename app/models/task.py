@@ -1,8 +1,12 @@
-from sqlalchemy import Column, String, DateTime, Text, Enum, ForeignKey
+from sqlalchemy import Column, String, DateTime, Text, Enum, ForeignKey, Integer, DDL, Index, event, func
 from sqlalchemy.orm import relationship
 from datetime import datetime
-import uuid
 from app.db.base import Base
+from app.db.types import CompactUUID, new_id
+from config import Config
+
+# Hash partitioning is PostgreSQL-only; other dialects ignore the postgresql_* table option
+TASKS_PARTITIONED = Config.TASK_PARTITION_COUNT > 0
 
 class TaskStatus:
     TODO = "todo"
@@ -12,8 +16,10 @@ class TaskStatus:
 class Task(Base):
     __tablename__ = "tasks"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    project_id = Column(String(36), ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    id = Column(CompactUUID, primary_key=True, default=new_id)
+    # A partitioned table's primary key must contain the partition key
+    project_id = Column(CompactUUID, ForeignKey('projects.id', ondelete='CASCADE'), nullable=False,
+                        primary_key=TASKS_PARTITIONED)
     title = Column(String(255), nullable=False)
     description = Column(Text)
     status = Column(Enum(TaskStatus.TODO, TaskStatus.DOING, TaskStatus.DONE, 
@@ -21,6 +27,21 @@ class Task(Base):
     deadline = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     closed_at = Column(DateTime, nullable=True)
+    # Bumped by every write; ORM flushes and versioned updates fail on a stale value
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    
+    __table_args__ = (
+        # Case-insensitive prefix lookups for typeahead, as on projects.name
+        Index("ix_tasks_title_lower", func.lower(title).label("title_lower"),
+              postgresql_ops={"title_lower": "text_pattern_ops"}),
+        # "Due next": open tasks walked in (deadline, id) order, overall and within a project
+        Index("ix_tasks_status_deadline", status, deadline, id),
+        Index("ix_tasks_project_status_deadline", project_id, status, deadline, id),
+        {"postgresql_partition_by": "HASH (project_id)"} if TASKS_PARTITIONED else {}
+    )
+    
+    # Identity stays the task id even when the table key is (id, project_id)
+    __mapper_args__ = {"primary_key": [id], "version_id_col": version}
     
     # Relationship with project
     project = relationship("Project", back_populates="tasks")
@@ -37,7 +58,8 @@ class Task(Base):
             'status': self.status,
             'deadline': self.deadline.isoformat() if self.deadline else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
-            'closed_at': self.closed_at.isoformat() if self.closed_at else None
+            'closed_at': self.closed_at.isoformat() if self.closed_at else None,
+            'version': self.version
         }
     
     def mark_closed(self):
@@ -48,3 +70,17 @@ class Task(Base):
         if self.deadline and self.status != TaskStatus.DONE:
             return datetime.utcnow() > self.deadline
         return False
+
+def task_partition_name(remainder: int) -> str:
+    return f"{Task.__tablename__}_p{remainder}"
+
+if TASKS_PARTITIONED:
+    for _remainder in range(Config.TASK_PARTITION_COUNT):
+        event.listen(
+            Task.__table__,
+            "after_create",
+            DDL(
+                f"CREATE TABLE IF NOT EXISTS {task_partition_name(_remainder)} PARTITION OF tasks "
+                f"FOR VALUES WITH (MODULUS {Config.TASK_PARTITION_COUNT}, REMAINDER {_remainder})"
+            ).execute_if(dialect="postgresql")
+        )
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, String, DateTime, Text, Enum, ForeignKey, Integer
+from datetime import datetime
+from app.db.base import Base
+from app.db.types import CompactUUID
+from app.models.task import TaskStatus
+
+class TaskArchive(Base):
+    __tablename__ = "tasks_archive"
+    
+    # Mirrors Task so rows can be moved with a plain INSERT ... SELECT
+    id = Column(CompactUUID, primary_key=True)
+    project_id = Column(CompactUUID, ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, index=True)
+    title = Column(String(255), nullable=False)
+    description = Column(Text)
+    status = Column(Enum(TaskStatus.TODO, TaskStatus.DOING, TaskStatus.DONE, 
+                        name='task_status'), default=TaskStatus.DONE)
+    deadline = Column(DateTime, nullable=True)
+    created_at = Column(DateTime)
+    closed_at = Column(DateTime, nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    archived_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<TaskArchive(id={self.id}, title='{self.title}', closed_at='{self.closed_at}')>"
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'project_id': self.project_id,
+            'title': self.title,
+            'description': self.description,
+            'status': self.status,
+            'deadline': self.deadline.isoformat() if self.deadline else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'closed_at': self.closed_at.isoformat() if self.closed_at else None,
+            'version': self.version,
+            'archived_at': self.archived_at.isoformat() if self.archived_at else None
+        }
@@ -0,0 +1,231 @@
+import collections
+import contextvars
+import cProfile
+import functools
+import hmac
+import inspect
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from typing import Callable, List, Optional
+from config import Config
+
+MODE_CPU = "cpu"
+MODE_SAMPLE = "sample"
+MODE_MEMORY = "memory"
+
+# Files an admin can download: what each mode writes and how to read it
+PROFILE_EXTENSIONS = {
+    MODE_CPU: ".prof",       # pstats.Stats / snakeviz
+    MODE_SAMPLE: ".folded",  # collapsed stacks for flamegraph.pl / speedscope
+    MODE_MEMORY: ".txt",     # tracemalloc top allocations by line
+}
+
+_PROFILE_NAME = re.compile(r"^[0-9]{8}T[0-9]{6}-(cpu|sample|memory)-[0-9a-f]{8}\.(prof|folded|txt)$")
+
+_current_profile = contextvars.ContextVar("current_profile", default=None)
+
+# tracemalloc's own bookkeeping is not interesting in a report
+_MEMORY_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+]
+
+def is_authorized(token: Optional[str]) -> bool:
+    """Profiling is admin-only; with no PROFILING_ADMIN_TOKEN set nobody is authorized."""
+    expected = Config.PROFILING_ADMIN_TOKEN
+    return bool(expected and token) and hmac.compare_digest(token.encode(), expected.encode())
+
+def profile_path(name: str) -> Optional[str]:
+    """Path of a stored profile; None for names this module would never have written."""
+    if not _PROFILE_NAME.match(name):
+        return None
+    path = os.path.join(Config.PROFILING_DIR, name)
+    return path if os.path.isfile(path) else None
+
+def list_profiles() -> List[dict]:
+    if not os.path.isdir(Config.PROFILING_DIR):
+        return []
+    profiles = []
+    for name in os.listdir(Config.PROFILING_DIR):
+        if _PROFILE_NAME.match(name):
+            stat = os.stat(os.path.join(Config.PROFILING_DIR, name))
+            profiles.append({
+                "name": name,
+                "mode": name.split("-")[1],
+                "size": stat.st_size,
+                "created_at": datetime.utcfromtimestamp(stat.st_mtime)
+            })
+    return sorted(profiles, key=lambda profile: profile["created_at"], reverse=True)
+
+def _prune_profiles():
+    profiles = sorted(name for name in os.listdir(Config.PROFILING_DIR) if _PROFILE_NAME.match(name))
+    for name in profiles[:max(len(profiles) - Config.PROFILING_MAX_FILES, 0)]:
+        try:
+            os.remove(os.path.join(Config.PROFILING_DIR, name))
+        except OSError:
+            pass
+
+class ProfileRateLimiter:
+    """At most max_per_hour profiles per process, and only one at a time.
+
+    Every mode slows the profiled work down and tracemalloc is process-wide,
+    so a second request asking for a profile while one runs is refused.
+    """
+
+    def __init__(self, max_per_hour: Optional[int] = None):
+        self.max_per_hour = max_per_hour if max_per_hour is not None else Config.PROFILING_MAX_PER_HOUR
+        self._started = collections.deque()
+        self._active = False
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            while self._started and now - self._started[0] >= 3600:
+                self._started.popleft()
+            if self._active or len(self._started) >= self.max_per_hour:
+                return False
+            self._started.append(now)
+            self._active = True
+            return True
+
+    def release(self):
+        with self._lock:
+            self._active = False
+
+# Shared by the middleware and the admin endpoints of this process
+rate_limiter = ProfileRateLimiter()
+
+class _StackSampler:
+    """Samples one thread's Python stack every interval into collapsed-stack counts."""
+
+    def __init__(self, thread_id: int, interval_seconds: float):
+        self.thread_id = thread_id
+        self.interval = interval_seconds
+        self.counts = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+class RequestProfile:
+    """One profile of one unit of work, written to PROFILING_DIR when run() finishes."""
+
+    def __init__(self, mode: str, label: str):
+        if mode not in PROFILE_EXTENSIONS:
+            raise ValueError(f"Profile mode must be one of: {', '.join(PROFILE_EXTENSIONS)}")
+        self.mode = mode
+        self.label = label
+        self.name = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{mode}-{uuid.uuid4().hex[:8]}{PROFILE_EXTENSIONS[mode]}"
+        self.saved = False
+        self.used = False
+
+    def run(self, function: Callable, *args, **kwargs):
+        # Only the first call is profiled, e.g. not a second endpoint in the same context
+        if self.used:
+            return function(*args, **kwargs)
+        self.used = True
+        profile = getattr(self, f"_run_{self.mode}")
+        return profile(functools.partial(function, *args, **kwargs))
+
+    def _path(self) -> str:
+        os.makedirs(Config.PROFILING_DIR, exist_ok=True)
+        return os.path.join(Config.PROFILING_DIR, self.name)
+
+    def _finish(self):
+        self.saved = True
+        _prune_profiles()
+
+    def _run_cpu(self, call: Callable):
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(call)
+        finally:
+            profiler.dump_stats(self._path())
+            self._finish()
+
+    def _run_sample(self, call: Callable):
+        sampler = _StackSampler(threading.get_ident(), Config.PROFILING_SAMPLE_INTERVAL_MS / 1000)
+        sampler.start()
+        try:
+            return call()
+        finally:
+            sampler.stop()
+            with open(self._path(), "w") as f:
+                for stack, count in sampler.counts.most_common():
+                    f.write(f"{stack} {count}\n")
+            self._finish()
+
+    def _run_memory(self, call: Callable):
+        already_tracing = tracemalloc.is_tracing()
+        if already_tracing:
+            before = tracemalloc.take_snapshot().filter_traces(_MEMORY_FILTERS)
+        else:
+            tracemalloc.start(Config.PROFILING_TRACEMALLOC_FRAMES)
+        tracemalloc.reset_peak()
+        try:
+            return call()
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces(_MEMORY_FILTERS)
+            if already_tracing:
+                statistics = snapshot.compare_to(before, "lineno")
+            else:
+                tracemalloc.stop()
+                statistics = snapshot.statistics("lineno")
+            with open(self._path(), "w") as f:
+                f.write(f"# {self.label}\n")
+                f.write(f"# traced memory at end: {current / 1024:.1f} KiB, peak: {peak / 1024:.1f} KiB\n")
+                # Other requests running at the same time show up here too; tracemalloc is process-wide
+                for statistic in statistics[:50]:
+                    f.write(f"{statistic}\n")
+            self._finish()
+
+def profile_context(profile: Optional[RequestProfile]) -> contextvars.Token:
+    return _current_profile.set(profile)
+
+def reset_profile_context(token: contextvars.Token):
+    _current_profile.reset(token)
+
+def profiled(function: Callable) -> Callable:
+    """Run function under the RequestProfile of the current context, if any.
+
+    Wraps at the function rather than the middleware so the profile is taken in
+    the thread that actually runs the endpoint. Without PROFILING_ENABLED the
+    function is returned unchanged, as are coroutine functions, whose work
+    would run after the wrapper returned.
+    """
+    if (not Config.PROFILING_ENABLED or getattr(function, "__profiled__", False)
+            or inspect.iscoroutinefunction(function)):
+        return function
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        profile = _current_profile.get()
+        if profile is None:
+            return function(*args, **kwargs)
+        return profile.run(function, *args, **kwargs)
+    wrapper.__profiled__ = True
+    return wrapper
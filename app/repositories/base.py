@@ -1,12 +1,17 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional, TypeVar, Generic
+from sqlalchemy.orm import Session
 from app.db.session import db_session
+from app.tracing.tracer import traced_class
 
 T = TypeVar('T')
 
+@traced_class("repository")
 class BaseRepository(ABC, Generic[T]):
-    def __init__(self):
-        self.session = db_session.get_session()
+    def __init__(self, session: Optional[Session] = None):
+        # Controllers pass their request-scoped session; CLI and jobs open their own on
+        # the primary, since a service checks (project exists, duplicate title) before it writes
+        self.session = session if session is not None else db_session.get_session()
     
     @abstractmethod
     def get_by_id(self, id: str) -> Optional[T]:
@@ -0,0 +1,65 @@
+from typing import List, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from app.models.idempotency_key import IdempotencyKey, IdempotencyStatus
+from app.repositories.base import BaseRepository
+from config import Config
+
+class IdempotencyRepository(BaseRepository[IdempotencyKey]):
+    def get_by_id(self, id: str) -> Optional[IdempotencyKey]:
+        return self.session.query(IdempotencyKey).filter(IdempotencyKey.key == id).first()
+    
+    def get_all(self) -> List[IdempotencyKey]:
+        return self.session.query(IdempotencyKey).order_by(IdempotencyKey.created_at).all()
+    
+    def create(self, record: IdempotencyKey) -> IdempotencyKey:
+        self.session.add(record)
+        self.commit()
+        return record
+    
+    def update(self, record: IdempotencyKey) -> IdempotencyKey:
+        self.session.add(record)
+        self.commit()
+        return record
+    
+    def delete(self, id: str) -> bool:
+        deleted = self.session.query(IdempotencyKey).filter(IdempotencyKey.key == id).delete()
+        self.commit()
+        return deleted > 0
+    
+    def claim(self, key: str, request_hash: str) -> Optional[IdempotencyKey]:
+        """Insert an in-progress record; returns None when the key was already claimed."""
+        record = IdempotencyKey(
+            key=key,
+            request_hash=request_hash,
+            status=IdempotencyStatus.IN_PROGRESS,
+            expires_at=datetime.utcnow() + timedelta(hours=Config.IDEMPOTENCY_TTL_HOURS)
+        )
+        try:
+            # An expired record for the same key is replaced in the same transaction
+            self.session.query(IdempotencyKey).filter(
+                IdempotencyKey.key == key,
+                IdempotencyKey.expires_at < datetime.utcnow()
+            ).delete(synchronize_session=False)
+            # The primary key makes concurrent claims race safely in the database
+            return self.create(record)
+        except IntegrityError:
+            return None
+    
+    def get_fresh(self, key: str) -> Optional[IdempotencyKey]:
+        self.session.expire_all()
+        return self.get_by_id(key)
+    
+    def complete(self, record: IdempotencyKey, status_code: int, body: str) -> IdempotencyKey:
+        record.status = IdempotencyStatus.COMPLETED
+        record.response_status = status_code
+        record.response_body = body
+        return self.update(record)
+    
+    def delete_expired(self) -> int:
+        result = self.session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.expires_at < datetime.utcnow())
+        )
+        self.commit()
+        return result.rowcount
@@ -0,0 +1,124 @@
+import json
+from typing import List, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import and_, func, update
+from app.models.job import Job, JobStatus
+from app.repositories.base import BaseRepository
+from app.exceptions.repository_exceptions import JobNotFoundException
+
+class JobRepository(BaseRepository[Job]):
+    def get_by_id(self, id: str) -> Optional[Job]:
+        return self.session.query(Job).filter(Job.id == id).first()
+    
+    def get_all(self) -> List[Job]:
+        return self.session.query(Job).order_by(Job.created_at).all()
+    
+    def get_active_by_dedupe_key(self, dedupe_key: str) -> Optional[Job]:
+        return self.session.query(Job).filter(
+            Job.dedupe_key == dedupe_key,
+            Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING])
+        ).first()
+    
+    def create(self, job: Job) -> Job:
+        self.session.add(job)
+        self.commit()
+        self.refresh(job)
+        return job
+    
+    def update(self, job: Job) -> Job:
+        self.session.add(job)
+        self.commit()
+        self.refresh(job)
+        return job
+    
+    def delete(self, id: str) -> bool:
+        job = self.get_by_id(id)
+        if not job:
+            raise JobNotFoundException(f"Job with id '{id}' not found")
+        
+        self.session.delete(job)
+        self.commit()
+        return True
+    
+    def claim_next(self) -> Optional[Job]:
+        """Move the oldest queued job to running; safe with several workers polling at once."""
+        now = datetime.utcnow()
+        row = self.session.query(Job.id).filter(
+            Job.status == JobStatus.QUEUED
+        ).order_by(Job.created_at).first()
+        if row is None:
+            self.session.rollback()
+            return None
+        
+        result = self.session.execute(
+            update(Job)
+            .where(Job.id == row[0], Job.status == JobStatus.QUEUED)
+            .values(status=JobStatus.RUNNING, started_at=now, heartbeat_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        self.commit()
+        # Another worker won the race for this job
+        if result.rowcount != 1:
+            return None
+        return self.get_by_id(row[0])
+    
+    def requeue_stale(self, lease_seconds: int) -> int:
+        """Put running jobs whose worker stopped heartbeating back in the queue.
+
+        Covers crashes, kills and shutdowns that left a job running: without this it
+        would keep its dedupe key, and the work it stands for could never be redone.
+        Handlers must therefore be safe to run again.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=lease_seconds)
+        result = self.session.execute(
+            update(Job)
+            .where(
+                Job.status == JobStatus.RUNNING,
+                func.coalesce(Job.heartbeat_at, Job.started_at, Job.created_at) < cutoff
+            )
+            .values(status=JobStatus.QUEUED, started_at=None, heartbeat_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        self.commit()
+        return result.rowcount
+    
+    def _owned(self, id: str, started_at: datetime):
+        # A claim is identified by its started_at; once the job is re-queued and
+        # claimed again, the earlier worker no longer matches and cannot write
+        return and_(Job.id == id, Job.status == JobStatus.RUNNING, Job.started_at == started_at)
+    
+    def renew_lease(self, id: str, started_at: datetime) -> bool:
+        """Push the heartbeat forward; False once this claim no longer owns the job."""
+        result = self.session.execute(
+            update(Job).where(self._owned(id, started_at)).values(heartbeat_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        self.commit()
+        return result.rowcount == 1
+    
+    def report_progress(self, job: Job, processed: int, total: Optional[int] = None) -> bool:
+        values = {"processed": processed, "heartbeat_at": datetime.utcnow()}
+        if total is not None:
+            values["total"] = total
+        result = self.session.execute(
+            update(Job).where(self._owned(job.id, job.started_at)).values(**values).execution_options(synchronize_session=False)
+        )
+        self.commit()
+        return result.rowcount == 1
+    
+    def finish(self, job: Job, result: Optional[dict] = None, error: Optional[str] = None) -> bool:
+        """Record the outcome of this worker's claim; False if the job was re-queued meanwhile."""
+        outcome = self.session.execute(
+            update(Job)
+            .where(self._owned(job.id, job.started_at))
+            .values(
+                status=JobStatus.FAILED if error else JobStatus.SUCCEEDED,
+                result=json.dumps(result) if result is not None else None,
+                error=error,
+                dedupe_key=None,
+                finished_at=datetime.utcnow()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.commit()
+        return outcome.rowcount == 1
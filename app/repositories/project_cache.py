@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional
+from config import Config
+
+class ProjectCache:
+    """Bounded in-process LRU of project name -> id and id -> summary.
+
+    Entries expire after a TTL so other workers' renames and deletes become
+    visible even without a broker. Publishers registered with
+    add_invalidation_publisher are called on every local invalidation and can
+    forward it to other workers, which apply it with apply_remote_invalidation.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.max_size = max_size or Config.PROJECT_CACHE_MAX_SIZE
+        self.ttl = ttl_seconds if ttl_seconds is not None else Config.PROJECT_CACHE_TTL_SECONDS
+        self._ids_by_name = OrderedDict()
+        self._summaries_by_id = OrderedDict()
+        self._publishers: List[Callable[[Optional[str], Optional[str]], None]] = []
+        self._lock = threading.Lock()
+
+    def get_id(self, name: str) -> Optional[str]:
+        return self._get(self._ids_by_name, name)
+
+    def get_summary(self, project_id: str) -> Optional[dict]:
+        return self._get(self._summaries_by_id, project_id)
+
+    def put(self, project_id: str, name: str, summary: Optional[dict] = None):
+        with self._lock:
+            self._put(self._ids_by_name, name, project_id)
+            if summary is not None:
+                self._put(self._summaries_by_id, project_id, summary)
+
+    def invalidate(self, project_id: Optional[str] = None, name: Optional[str] = None):
+        self.apply_remote_invalidation(project_id, name)
+        for publish in self._publishers:
+            try:
+                publish(project_id, name)
+            except Exception:
+                # Remote workers still converge through the TTL
+                pass
+
+    def apply_remote_invalidation(self, project_id: Optional[str] = None, name: Optional[str] = None):
+        with self._lock:
+            if name is not None:
+                self._ids_by_name.pop(name, None)
+            if project_id is not None:
+                self._summaries_by_id.pop(project_id, None)
+                for cached_name in [n for n, (pid, _) in self._ids_by_name.items() if pid == project_id]:
+                    del self._ids_by_name[cached_name]
+
+    def add_invalidation_publisher(self, publisher: Callable[[Optional[str], Optional[str]], None]):
+        self._publishers.append(publisher)
+
+    def clear(self):
+        with self._lock:
+            self._ids_by_name.clear()
+            self._summaries_by_id.clear()
+
+    def _get(self, entries: OrderedDict, key: str):
+        with self._lock:
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del entries[key]
+                return None
+            entries.move_to_end(key)
+            return value
+
+    def _put(self, entries: OrderedDict, key: str, value):
+        entries[key] = (value, time.monotonic() + self.ttl)
+        entries.move_to_end(key)
+        while len(entries) > self.max_size:
+            entries.popitem(last=False)
+
+# Shared by every repository and controller in this process
+project_cache = ProjectCache()
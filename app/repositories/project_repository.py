@@ -1,19 +1,153 @@
-from typing import List, Optional
-from sqlalchemy import func
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 from app.models.project import Project
+from app.models.task import Task
+from app.models.task_archive import TaskArchive
 from app.repositories.base import BaseRepository
-from app.exceptions.repository_exceptions import ProjectNotFoundException, DuplicateProjectException
+from app.db.session import db_session
+from app.repositories.project_cache import project_cache
+from app.repositories.suggest_index import prefix_filter, suggest_index
+from app.exceptions.repository_exceptions import (
+    ProjectNotFoundException, DuplicateProjectException, VersionConflictException
+)
+from config import Config
+from app.tracing.tracer import traced_class
 
+# Built once; see the note on the pre-built statements in task_repository
+_PROJECT_BY_ID = select(Project).where(Project.id == bindparam("id")).limit(1)
+_PROJECT_BY_NAME = select(Project).where(Project.name == bindparam("name")).limit(1)
+_PROJECT_ID_BY_NAME = select(Project.id).where(Project.name == bindparam("name")).limit(1)
+_PROJECT_NAME_BY_ID = select(Project.name).where(Project.id == bindparam("id")).limit(1)
+_PROJECT_COUNT = select(func.count(Project.id))
+
+@traced_class("repository")
 class ProjectRepository(BaseRepository[Project]):
+    # Columns a client may select with ?fields=
+    SPARSE_FIELDS = ("id", "name", "description", "created_at", "version")
+    
     def get_by_id(self, id: str) -> Optional[Project]:
-        return self.session.query(Project).filter(Project.id == id).first()
+        return self.session.execute(_PROJECT_BY_ID, {"id": id}).scalars().first()
     
     def get_by_name(self, name: str) -> Optional[Project]:
-        return self.session.query(Project).filter(Project.name == name).first()
+        return self.session.execute(_PROJECT_BY_NAME, {"name": name}).scalars().first()
+    
+    def get_id_by_name(self, name: str, verify: bool = False) -> Optional[str]:
+        """Project id for a name, from the cache when possible.
+        
+        The cache can lag other workers' renames and deletes by its TTL, so writes
+        pass verify=True to check a cached id against the table in their own
+        transaction before using it.
+        """
+        project_id = project_cache.get_id(name)
+        if project_id is not None and verify:
+            if self.session.execute(_PROJECT_NAME_BY_ID, {"id": project_id}).scalar() != name:
+                project_cache.invalidate(project_id, name)
+                project_id = None
+        if project_id is None:
+            project_id = self.session.execute(_PROJECT_ID_BY_NAME, {"name": name}).scalar()
+            if project_id is None:
+                return None
+            project_cache.put(project_id, name)
+        return project_id
+    
+    def get_summary(self, id: str) -> Optional[dict]:
+        summary = project_cache.get_summary(id)
+        if summary is None:
+            project = self.get_by_id(id)
+            if project is None:
+                return None
+            summary = {
+                "id": project.id,
+                "name": project.name,
+                "description": project.description,
+                "created_at": project.created_at,
+                "version": project.version
+            }
+            project_cache.put(project.id, project.name, summary)
+        return summary
     
     def get_all(self) -> List[Project]:
         return self.session.query(Project).order_by(Project.created_at).all()
     
+    def get_with_tasks(
+        self,
+        project_id: Optional[str] = None,
+        task_limit: Optional[int] = None,
+        task_status: Optional[str] = None
+    ) -> List[Project]:
+        """Projects with their tasks in two queries: the projects, then one selectinload.
+        
+        task_limit keeps the first N tasks per project (by created_at) and
+        task_status filters them; the collections then hold only those tasks.
+        """
+        criteria = []
+        if task_status:
+            criteria.append(Task.status == task_status)
+        if task_limit:
+            ranked = select(
+                Task.id,
+                func.row_number().over(partition_by=Task.project_id, order_by=Task.created_at).label("position")
+            ).where(*criteria)
+            if project_id:
+                ranked = ranked.where(Task.project_id == project_id)
+            ranked = ranked.subquery()
+            criteria.append(Task.id.in_(select(ranked.c.id).where(ranked.c.position <= task_limit)))
+        
+        tasks = Project.tasks.and_(*criteria) if criteria else Project.tasks
+        # populate_existing so a project already in the session gets the filtered collection
+        query = self.session.query(Project).options(selectinload(tasks)).populate_existing()
+        if project_id:
+            query = query.filter(Project.id == project_id)
+        return query.order_by(Project.created_at).all()
+    
+    def get_fields(self, fields: Sequence[str]) -> List[dict]:
+        query = self.session.query(*[getattr(Project, field) for field in fields]).order_by(Project.created_at)
+        return [dict(row._mapping) for row in query]
+    
+    def suggest(self, prefix: str, limit: int) -> List[dict]:
+        """Projects whose name starts with prefix (case-insensitive), in name order."""
+        matches = suggest_index.search(Project, prefix, limit, self._suggest_rows, self.count)
+        if matches is not None:
+            return [{"id": id, "name": name} for name, id, _ in matches]
+        
+        # Index too large to keep in memory (or disabled): the lower(name) expression index serves this
+        name = func.lower(Project.name)
+        rows = self.session.execute(
+            select(Project.id, Project.name)
+            .where(prefix_filter(name, prefix, db_session.engine.dialect.name))
+            .order_by(name, Project.name, Project.id)
+            .limit(limit)
+        )
+        return [dict(row._mapping) for row in rows]
+    
+    def _suggest_rows(self, limit: int) -> List[tuple]:
+        return self.session.execute(select(Project.id, Project.name).limit(limit)).all()
+    
+    def iter_with_task_counts(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[Tuple[Project, int]]:
+        # One grouped count instead of loading every project's task collection
+        task_counts = self.session.query(
+            Task.project_id,
+            func.count(Task.id).label("task_count")
+        ).group_by(Task.project_id).subquery()
+        
+        query = self.session.query(
+            Project,
+            func.coalesce(task_counts.c.task_count, 0)
+        ).outerjoin(task_counts, task_counts.c.project_id == Project.id).order_by(Project.created_at)
+        
+        if offset:
+            query = query.offset(offset)
+        if limit:
+            query = query.limit(limit)
+        return query.yield_per(chunk_size or Config.STREAM_CHUNK_SIZE)
+    
     def create(self, project: Project) -> Project:
         # Check for duplicate name
         existing = self.get_by_name(project.name)
@@ -37,20 +171,67 @@ class ProjectRepository(BaseRepository[Project]):
         
         self.session.add(project)
         self.commit()
+        # Drops the old name too, since entries are also found by id
+        project_cache.invalidate(project_id=project.id)
         self.refresh(project)
         return project
     
-    def delete(self, id: str) -> bool:
+    def update_returning(self, id: str, values: dict, expected_version: Optional[int] = None) -> Project:
+        """One UPDATE ... RETURNING; with expected_version it only applies to an unchanged row.
+        
+        The unique name constraint replaces a separate duplicate-name lookup.
+        """
+        statement = update(Project).where(Project.id == id)
+        if expected_version is not None:
+            statement = statement.where(Project.version == expected_version)
+        try:
+            project = self.session.execute(
+                statement.values(**values, version=Project.version + 1).returning(Project)
+            ).scalars().first()
+            self.commit()
+        except IntegrityError:
+            self.session.rollback()
+            raise DuplicateProjectException(f"Project with name '{values.get('name')}' already exists")
+        
+        if project is None:
+            if expected_version is not None and self.get_by_id(id) is not None:
+                raise VersionConflictException(f"Project '{id}' was modified by another request; reload it and retry")
+            raise ProjectNotFoundException(f"Project with id '{id}' not found")
+        
+        project_cache.invalidate(project_id=id)
+        return project
+    
+    def delete(self, id: str, progress: Optional[Callable[[int, int], None]] = None) -> bool:
         project = self.get_by_id(id)
         if not project:
             raise ProjectNotFoundException(f"Project with id '{id}' not found")
         
+        # Children go first in bounded chunks so no single transaction holds every row
+        total = self.session.query(func.count(Task.id)).filter(Task.project_id == id).scalar()
+        total += self.session.query(func.count(TaskArchive.id)).filter(TaskArchive.project_id == id).scalar()
+        deleted = 0
+        for model in (Task, TaskArchive):
+            while True:
+                chunk = select(model.id).where(model.project_id == id).limit(Config.BULK_OPERATION_CHUNK_SIZE)
+                result = self.session.execute(
+                    delete(model)
+                    .where(model.id.in_(chunk.scalar_subquery()))
+                    .execution_options(synchronize_session=False)
+                )
+                self.commit()
+                if result.rowcount == 0:
+                    break
+                deleted += result.rowcount
+                if progress:
+                    progress(deleted, total)
+        
         self.session.delete(project)
         self.commit()
+        project_cache.invalidate(project_id=id)
         return True
     
     def count(self) -> int:
-        return self.session.query(func.count(Project.id)).scalar()
+        return self.session.execute(_PROJECT_COUNT).scalar()
     
     def project_exists(self, name: str) -> bool:
-        return self.session.query(Project).filter(Project.name == name).first() is not None
+        return self.session.execute(_PROJECT_ID_BY_NAME, {"name": name}).first() is not None
@@ -0,0 +1,88 @@
+import itertools
+import threading
+import time
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models.project import Project
+from app.models.task import Task
+from config import Config
+
+_TOUCHED_KEY = "stats_touched_projects"
+_ALL_PROJECTS = object()
+
+class StatsCache:
+    """Per-project (and org-wide) stats results, dropped whenever a task write commits.
+
+    Keys are (project_id, days); project_id None is the org-wide report, which
+    any task write invalidates. The TTL bounds staleness from writes made by
+    other processes.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        self.ttl = ttl_seconds if ttl_seconds is not None else Config.STATS_CACHE_TTL_SECONDS
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, project_id: Optional[str], days: int) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get((project_id, days))
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[(project_id, days)]
+                return None
+            return value
+
+    def put(self, project_id: Optional[str], days: int, stats: dict):
+        with self._lock:
+            self._entries[(project_id, days)] = (stats, time.monotonic() + self.ttl)
+
+    def invalidate(self, project_id: str):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in (project_id, None)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# Shared by every request in this process
+stats_cache = StatsCache()
+
+# Writes are collected per session and applied on commit, so a report computed
+# mid-transaction can never be cached past the commit that changes it
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_writes(session, flush_context):
+    touched = session.info.setdefault(_TOUCHED_KEY, set())
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Task):
+            touched.add(obj.project_id)
+        elif isinstance(obj, Project) and obj in session.deleted:
+            touched.add(obj.id)
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_writes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in (Task, Project):
+        # Bulk statements do not say which projects they hit
+        orm_execute_state.session.info.setdefault(_TOUCHED_KEY, set()).add(_ALL_PROJECTS)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_writes(session):
+    touched = session.info.pop(_TOUCHED_KEY, None)
+    if not touched:
+        return
+    if _ALL_PROJECTS in touched:
+        stats_cache.clear()
+        return
+    for project_id in touched:
+        stats_cache.invalidate(project_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_writes(session):
+    session.info.pop(_TOUCHED_KEY, None)
@@ -0,0 +1,280 @@
+import bisect
+import itertools
+import string
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import and_, event, inspect
+from sqlalchemy.orm import Session
+from app.db.session import db_session
+from app.models.project import Project
+from app.models.task import Task
+from config import Config
+
+_PENDING_KEY = "suggest_index_pending"
+_STALE = object()
+
+# Writes that change one of these columns can move an entry in the index
+_INDEXED_COLUMNS = {Project: {"name"}, Task: {"title", "project_id"}}
+
+# A table found too large is only counted again after this many TTLs
+_TOO_LARGE_RECHECK_TTLS = 10
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+_MAX_CODE_POINT = 0x10FFFF
+_SURROGATES = range(0xD800, 0xE000)
+
+def fold_case(text: str, dialect_name: str) -> str:
+    """Lower-case text the way the database's lower() does, so the index and its fallback agree."""
+    # SQLite's built-in lower() only folds ASCII; PostgreSQL's folds Unicode like str.lower
+    return text.translate(_ASCII_LOWER) if dialect_name == "sqlite" else text.lower()
+
+def _prefix_upper_bound(key: str) -> Optional[str]:
+    """Smallest string greater than every string starting with key; None if there is none."""
+    key = key.rstrip(chr(_MAX_CODE_POINT))
+    if not key:
+        return None
+    code_point = ord(key[-1]) + 1
+    # Surrogates cannot be encoded as UTF-8, and nothing stored falls between them
+    if code_point in _SURROGATES:
+        code_point = _SURROGATES.stop
+    return key[:-1] + chr(code_point)
+
+def prefix_filter(expression, prefix: str, dialect_name: str):
+    """Prefix match on a lower(...) expression that its expression index can serve."""
+    key = fold_case(prefix, dialect_name)
+    if dialect_name == "postgresql":
+        # LIKE 'abc%' uses the text_pattern_ops index whatever the database collation
+        return expression.startswith(key, autoescape=True)
+    # SQLite only uses an expression index for comparisons, not for LIKE; its
+    # default BINARY collation orders UTF-8 text by code point
+    upper_bound = _prefix_upper_bound(key)
+    if upper_bound is None:
+        return expression >= key
+    return and_(expression >= key, expression < upper_bound)
+
+class SortedPrefixIndex:
+    """Entries sorted by case-folded text; a prefix lookup is one bisect plus k reads."""
+
+    def __init__(self, fold: Callable[[str], str] = str.lower):
+        self.fold = fold
+        self._entries: List[Tuple[str, str, str]] = []
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, text: str, id: str):
+        bisect.insort(self._entries, (self.fold(text), text, id))
+
+    def remove(self, text: str, id: str):
+        entry = (self.fold(text), text, id)
+        index = bisect.bisect_left(self._entries, entry)
+        if index < len(self._entries) and self._entries[index] == entry:
+            del self._entries[index]
+
+    def search(self, prefix: str, limit: int) -> List[Tuple[str, str]]:
+        key = self.fold(prefix)
+        results = []
+        for folded, text, id in itertools.islice(self._entries, bisect.bisect_left(self._entries, (key,)), None):
+            if not folded.startswith(key) or len(results) >= limit:
+                break
+            results.append((text, id))
+        return results
+
+class _Kind:
+    """Index state for one model: everything, plus per-project views for tasks."""
+
+    def __init__(self, fold: Callable[[str], str] = str.lower):
+        self.fold = fold
+        self.all = SortedPrefixIndex(fold)
+        self.by_scope: Dict[str, SortedPrefixIndex] = {}
+        self.entries: Dict[str, Tuple[str, Optional[str]]] = {}
+        self.loaded_at: Optional[float] = None
+        self.too_large = False
+        self.stale = True
+
+    def upsert(self, id: str, text: str, scope: Optional[str] = None):
+        if self.entries.get(id) == (text, scope):
+            return
+        self.remove(id)
+        self.entries[id] = (text, scope)
+        self.all.add(text, id)
+        if scope is not None:
+            if scope not in self.by_scope:
+                self.by_scope[scope] = SortedPrefixIndex(self.fold)
+            self.by_scope[scope].add(text, id)
+
+    def remove(self, id: str):
+        previous = self.entries.pop(id, None)
+        if previous is None:
+            return
+        text, scope = previous
+        self.all.remove(text, id)
+        if scope is not None and scope in self.by_scope:
+            self.by_scope[scope].remove(text, id)
+            if not self.by_scope[scope]:
+                del self.by_scope[scope]
+
+class SuggestIndex:
+    """In-process typeahead index of project names and task titles.
+
+    Each kind is loaded from the database on first use and then kept current by
+    the commits of this process. Bulk statements that may change indexed columns
+    mark it stale, and a reload happens on the next lookup. The TTL bounds
+    staleness from other processes. When a table has more than max_entries rows
+    the index stays off and callers fall back to the database; that is decided
+    by a count, not by loading the rows, and rechecked only every few TTLs.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        dialect_name: Optional[str] = None
+    ):
+        self.max_entries = max_entries if max_entries is not None else Config.SUGGEST_INDEX_MAX_ENTRIES
+        self.ttl = ttl_seconds if ttl_seconds is not None else Config.SUGGEST_INDEX_TTL_SECONDS
+        # Fold like the database's lower(), which the fallback queries compare against
+        dialect_name = dialect_name or db_session.engine.dialect.name
+        self.fold = lambda text: fold_case(text, dialect_name)
+        self._kinds = {Project: _Kind(self.fold), Task: _Kind(self.fold)}
+        self._lock = threading.RLock()
+
+    def search(
+        self,
+        model,
+        prefix: str,
+        limit: int,
+        loader: Callable[[int], Iterable[tuple]],
+        counter: Callable[[], int],
+        scope: Optional[str] = None
+    ) -> Optional[List[Tuple[str, str, Optional[str]]]]:
+        """(text, id, scope) matches in order, or None when the caller has to ask the database.
+
+        loader(limit) returns (id, text[, scope]) rows, at most limit of them;
+        counter() returns the table's row count.
+        """
+        if not Config.SUGGEST_INDEX_ENABLED:
+            return None
+        with self._lock:
+            kind = self._kinds[model]
+            if self._needs_load(kind):
+                kind = self._kinds[model] = self._load(loader, counter)
+            if kind.too_large:
+                return None
+            index = kind.all if scope is None else kind.by_scope.get(scope)
+            if index is None:
+                return []
+            return [(text, id, kind.entries[id][1]) for text, id in index.search(prefix, limit)]
+
+    def apply(self, model, changes: List[tuple]):
+        """Apply committed (id, text, scope) upserts and (id, None, None) removals."""
+        with self._lock:
+            kind = self._kinds[model]
+            if kind.loaded_at is None or kind.too_large:
+                return
+            for id, text, scope in changes:
+                if text is None:
+                    kind.remove(id)
+                else:
+                    kind.upsert(id, text, scope)
+
+    def mark_stale(self, model):
+        with self._lock:
+            self._kinds[model].stale = True
+
+    def clear(self):
+        with self._lock:
+            self._kinds = {Project: _Kind(self.fold), Task: _Kind(self.fold)}
+
+    def _needs_load(self, kind: _Kind) -> bool:
+        if kind.stale or kind.loaded_at is None:
+            return True
+        ttl = self.ttl * _TOO_LARGE_RECHECK_TTLS if kind.too_large else self.ttl
+        return time.monotonic() - kind.loaded_at >= ttl
+
+    def _load(self, loader: Callable[[int], Iterable[tuple]], counter: Callable[[], int]) -> _Kind:
+        # Runs under the lock, so commits finishing meanwhile are applied to the fresh index
+        fresh = _Kind(self.fold)
+        fresh.loaded_at = time.monotonic()
+        fresh.stale = False
+        if counter() > self.max_entries:
+            fresh.too_large = True
+            return fresh
+        # Rows may have been added since the count
+        rows = list(loader(self.max_entries + 1))
+        fresh.too_large = len(rows) > self.max_entries
+        if not fresh.too_large:
+            for row in rows:
+                fresh.upsert(row[0], row[1], row[2] if len(row) > 2 else None)
+        return fresh
+
+# Shared by every repository in this process
+suggest_index = SuggestIndex()
+
+# Like the stats cache: changes are collected per session and applied on commit,
+# so an uncommitted rename is never suggested to other requests
+
+def _updated_columns(orm_execute_state) -> Optional[set]:
+    values = getattr(orm_execute_state.statement, "_values", None)
+    if values:
+        return {getattr(column, "key", column) for column in values}
+    parameters = orm_execute_state.parameters
+    if isinstance(parameters, list) and parameters:
+        # Bulk UPDATE by primary key: one parameter dict per row
+        return set(parameters[0])
+    return None
+
+def _pending(session) -> dict:
+    return session.info.setdefault(_PENDING_KEY, {Project: [], Task: []})
+
+def _record(pending: dict, model, change: tuple):
+    if pending[model] is not _STALE:
+        pending[model].append(change)
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_changes(session, flush_context):
+    pending = _pending(session)
+    for obj in itertools.chain(session.new, session.dirty):
+        if type(obj) not in _INDEXED_COLUMNS:
+            continue
+        # Read loaded values only; emitting SQL inside a flush event is not allowed
+        values = inspect(obj).dict
+        if isinstance(obj, Project) and "name" in values:
+            _record(pending, Project, (obj.id, values["name"], None))
+        elif isinstance(obj, Task) and "title" in values and "project_id" in values:
+            _record(pending, Task, (obj.id, values["title"], values["project_id"]))
+        else:
+            pending[type(obj)] = _STALE
+    for obj in session.deleted:
+        if type(obj) in _INDEXED_COLUMNS:
+            _record(pending, type(obj), (obj.id, None, None))
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_changes(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ not in _INDEXED_COLUMNS:
+        return
+    if orm_execute_state.is_update:
+        columns = _updated_columns(orm_execute_state)
+        if columns is not None and not columns & _INDEXED_COLUMNS[mapper.class_]:
+            return
+    # Bulk statements do not say which rows they hit
+    _pending(orm_execute_state.session)[mapper.class_] = _STALE
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_changes(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    for model, changes in pending.items():
+        if changes is _STALE:
+            suggest_index.mark_stale(model)
+        elif changes:
+            suggest_index.apply(model, changes)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_changes(session):
+    session.info.pop(_PENDING_KEY, None)
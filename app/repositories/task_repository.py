@@ -1,20 +1,63 @@
-from typing import List, Optional
+import heapq
+import itertools
+from typing import Iterator, List, Optional, Sequence, Tuple
 from datetime import datetime
-from sqlalchemy import and_
+from sqlalchemy import and_, bindparam, case, delete, func, insert, literal, select, update
+from sqlalchemy.orm import defer
 from app.models.task import Task, TaskStatus
+from app.models.task_archive import TaskArchive
 from app.models.project import Project
+from app.db.session import db_session
 from app.repositories.base import BaseRepository
-from app.exceptions.repository_exceptions import TaskNotFoundException, ProjectNotFoundException, DuplicateTaskException
+from app.repositories.suggest_index import prefix_filter, suggest_index
+from app.repositories.write_coalescer import get_task_write_coalescer
+from app.exceptions.repository_exceptions import (
+    TaskNotFoundException, ProjectNotFoundException, DuplicateTaskException, VersionConflictException
+)
+from config import Config
+from app.tracing.tracer import traced_class
 
+def status_update_values(status: str) -> dict:
+    values = {"status": status}
+    # Same closed_at rule as a single status change: stamp it once, never overwrite
+    if status == TaskStatus.DONE:
+        values["closed_at"] = func.coalesce(Task.closed_at, datetime.utcnow())
+    return values
+
+def _next_version(values: dict) -> dict:
+    return {**values, "version": Task.version + 1}
+
+# Hot lookups are built once at import; each call only binds parameters, and the
+# engine's compiled cache (DB_COMPILED_CACHE_SIZE) skips recompiling the SQL
+_TASK_BY_ID = select(Task).where(Task.id == bindparam("id")).limit(1)
+_TASK_BY_ID_IN_PROJECT = select(Task).where(
+    Task.id == bindparam("id"),
+    Task.project_id == bindparam("project_id")
+).limit(1)
+_TASK_BY_TITLE_AND_PROJECT = select(Task).where(
+    Task.title == bindparam("title"),
+    Task.project_id == bindparam("project_id")
+).limit(1)
+_TASK_COUNT = select(func.count(Task.id))
+_TASK_COUNT_BY_PROJECT = select(func.count(Task.id)).where(Task.project_id == bindparam("project_id"))
+
+@traced_class("repository")
 class TaskRepository(BaseRepository[Task]):
-    def get_by_id(self, id: str) -> Optional[Task]:
-        return self.session.query(Task).filter(Task.id == id).first()
+    # Columns a client may select with ?fields=
+    SPARSE_FIELDS = (
+        "id", "project_id", "title", "description", "status", "deadline", "created_at", "closed_at", "version"
+    )
+    
+    def get_by_id(self, id: str, project_id: Optional[str] = None) -> Optional[Task]:
+        # With a partitioned tasks table, project_id lets the planner prune to one partition
+        if project_id:
+            return self.session.execute(_TASK_BY_ID_IN_PROJECT, {"id": id, "project_id": project_id}).scalars().first()
+        return self.session.execute(_TASK_BY_ID, {"id": id}).scalars().first()
     
     def get_by_title_and_project(self, title: str, project_id: str) -> Optional[Task]:
-        return self.session.query(Task).filter(
-            Task.title == title,
-            Task.project_id == project_id
-        ).first()
+        return self.session.execute(
+            _TASK_BY_TITLE_AND_PROJECT, {"title": title, "project_id": project_id}
+        ).scalars().first()
     
     def get_all(self) -> List[Task]:
         return self.session.query(Task).order_by(Task.created_at).all()
@@ -22,6 +65,91 @@ class TaskRepository(BaseRepository[Task]):
     def get_by_project_id(self, project_id: str) -> List[Task]:
         return self.session.query(Task).filter(Task.project_id == project_id).order_by(Task.created_at).all()
     
+    def get_fields(
+        self,
+        fields: Sequence[str],
+        project_id: Optional[str] = None,
+        include_archived: bool = False
+    ) -> List[dict]:
+        """Select only the given columns, as plain dicts ordered by created_at."""
+        rows = self._select_fields(Task, fields, project_id)
+        if include_archived:
+            rows = heapq.merge(
+                rows,
+                self._select_fields(TaskArchive, fields, project_id),
+                key=lambda row: row["_sort_key"] or datetime.min
+            )
+        return [{field: row[field] for field in fields} for row in rows]
+    
+    def get_fields_by_id(self, id: str, fields: Sequence[str], include_archived: bool = False) -> Optional[dict]:
+        for model in (Task, TaskArchive) if include_archived else (Task,):
+            row = self.session.query(*[getattr(model, field) for field in fields]).filter(model.id == id).first()
+            if row is not None:
+                return dict(row._mapping)
+        return None
+    
+    def suggest(self, prefix: str, limit: int, project_id: Optional[str] = None) -> List[dict]:
+        """Tasks whose title starts with prefix (case-insensitive), in title order."""
+        matches = suggest_index.search(Task, prefix, limit, self._suggest_rows, self._suggest_count, scope=project_id)
+        if matches is not None:
+            return [{"id": id, "project_id": scope, "title": title} for title, id, scope in matches]
+        
+        # Index too large to keep in memory (or disabled): the lower(title) expression index serves this
+        title = func.lower(Task.title)
+        query = select(Task.id, Task.project_id, Task.title).where(
+            prefix_filter(title, prefix, db_session.engine.dialect.name)
+        )
+        if project_id:
+            query = query.where(Task.project_id == project_id)
+        rows = self.session.execute(query.order_by(title, Task.title, Task.id).limit(limit))
+        return [dict(row._mapping) for row in rows]
+    
+    def _suggest_rows(self, limit: int) -> List[tuple]:
+        return self.session.execute(select(Task.id, Task.title, Task.project_id).limit(limit)).all()
+    
+    def _suggest_count(self) -> int:
+        return self.session.execute(_TASK_COUNT).scalar()
+    
+    def _select_fields(self, model, fields: Sequence[str], project_id: Optional[str]) -> List[dict]:
+        query = self.session.query(*[getattr(model, field) for field in fields], model.created_at.label("_sort_key"))
+        if project_id:
+            query = query.filter(model.project_id == project_id)
+        return [dict(row._mapping) for row in query.order_by(model.created_at)]
+    
+    def iter_all(
+        self,
+        project_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[Task]:
+        query = self.session.query(Task)
+        if project_id:
+            query = query.filter(Task.project_id == project_id)
+        return self._stream(query.order_by(Task.created_at), limit, offset, chunk_size)
+    
+    def iter_overdue_tasks(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[Task]:
+        query = self.session.query(Task).filter(
+            and_(
+                Task.deadline < datetime.utcnow(),
+                Task.status != TaskStatus.DONE
+            )
+        )
+        return self._stream(query.order_by(Task.deadline), limit, offset, chunk_size)
+    
+    def _stream(self, query, limit: Optional[int], offset: int, chunk_size: Optional[int]) -> Iterator[Task]:
+        if offset:
+            query = query.offset(offset)
+        if limit:
+            query = query.limit(limit)
+        # Fetches in chunks (a server-side cursor on PostgreSQL) instead of .all()
+        return query.yield_per(chunk_size or Config.STREAM_CHUNK_SIZE)
+    
     def create(self, task: Task) -> Task:
         # Verify project exists
         project = self.session.query(Project).filter(Project.id == task.project_id).first()
@@ -44,6 +172,42 @@ class TaskRepository(BaseRepository[Task]):
         self.refresh(task)
         return task
     
+    def update_fields(self, id: str, values: dict) -> bool:
+        """Single UPDATE by id; returns False when the task does not exist."""
+        values = _next_version(values)
+        if Config.WRITE_COALESCING_ENABLED:
+            # Blocks until the batch holding this write has committed
+            return get_task_write_coalescer().submit(id, values).result()
+        
+        result = self.session.execute(
+            update(Task)
+            .where(Task.id == id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        self.commit()
+        return result.rowcount > 0
+    
+    def update_returning(self, id: str, values: dict, expected_version: Optional[int] = None) -> Task:
+        """One UPDATE ... RETURNING; with expected_version it only applies to an unchanged row.
+        
+        Raises VersionConflictException when the task exists at another version.
+        """
+        statement = update(Task).where(Task.id == id)
+        if expected_version is not None:
+            statement = statement.where(Task.version == expected_version)
+        task = self.session.execute(
+            statement.values(**_next_version(values)).returning(Task)
+        ).scalars().first()
+        self.commit()
+        
+        if task is None:
+            # Only a failed update pays for the lookup that tells a stale version from a missing task
+            if expected_version is not None and self.get_by_id(id) is not None:
+                raise VersionConflictException(f"Task '{id}' was modified by another request; reload it and retry")
+            raise TaskNotFoundException(f"Task with id '{id}' not found")
+        return task
+    
     def delete(self, id: str) -> bool:
         task = self.get_by_id(id)
         if not task:
@@ -54,11 +218,86 @@ class TaskRepository(BaseRepository[Task]):
         return True
     
     def count_by_project(self, project_id: str) -> int:
-        from sqlalchemy import func
-        return self.session.query(func.count(Task.id)).filter(Task.project_id == project_id).scalar()
+        return self.session.execute(_TASK_COUNT_BY_PROJECT, {"project_id": project_id}).scalar()
+    
+    def count_by_status(self, project_id: Optional[str] = None) -> dict:
+        query = self.session.query(Task.status, func.count(Task.id))
+        if project_id:
+            query = query.filter(Task.project_id == project_id)
+        return dict(query.group_by(Task.status).all())
+    
+    # Closed tasks move to tasks_archive after TASK_ARCHIVE_RETENTION_DAYS (or sooner with
+    # "archive --days"), so the windowed aggregates below read both tables
+    
+    def count_by_day(self, column_name: str, since: datetime, project_id: Optional[str] = None) -> List[Tuple[str, int]]:
+        """(YYYY-MM-DD, count) for tasks whose created_at/closed_at falls on each day since `since`."""
+        counts = {}
+        for model in (Task, TaskArchive):
+            column = getattr(model, column_name)
+            day = func.date(column)
+            query = self.session.query(day, func.count(model.id)).filter(column >= since)
+            if project_id:
+                query = query.filter(model.project_id == project_id)
+            for date, count in query.group_by(day):
+                counts[str(date)] = counts.get(str(date), 0) + count
+        return sorted(counts.items())
+    
+    def count_deadline_outcomes(self, since: datetime, project_id: Optional[str] = None) -> Tuple[int, int, int]:
+        """(closed, closed with a deadline, closed on time) for tasks closed since `since`."""
+        totals = [0, 0, 0]
+        for model in (Task, TaskArchive):
+            query = self.session.query(
+                func.count(model.id),
+                func.count(model.deadline),
+                func.coalesce(func.sum(case((model.closed_at <= model.deadline, 1), else_=0)), 0)
+            ).filter(model.status == TaskStatus.DONE, model.closed_at >= since)
+            if project_id:
+                query = query.filter(model.project_id == project_id)
+            totals = [total + int(value) for total, value in zip(totals, query.one())]
+        closed, with_deadline, on_time = totals
+        return closed, with_deadline, on_time
+    
+    def get_cycle_timestamps(self, since: datetime, project_id: Optional[str] = None) -> List[Tuple[datetime, datetime]]:
+        timestamps = []
+        for model in (Task, TaskArchive):
+            query = self.session.query(model.created_at, model.closed_at).filter(
+                model.closed_at >= since,
+                model.created_at.isnot(None)
+            )
+            if project_id:
+                query = query.filter(model.project_id == project_id)
+            timestamps.extend(query.all())
+        return timestamps
+    
+    def get_open_deadlines(self, project_id: Optional[str] = None) -> List[datetime]:
+        query = self.session.query(Task.deadline).filter(
+            Task.deadline.isnot(None),
+            Task.status != TaskStatus.DONE
+        )
+        if project_id:
+            query = query.filter(Task.project_id == project_id)
+        return [deadline for deadline, in query]
+    
+    def get_due(self, limit: int, until: Optional[datetime] = None, project_id: Optional[str] = None) -> List[Task]:
+        """The `limit` open tasks with the nearest upcoming deadlines, soonest first.
+        
+        Each open status is one range scan of the (status, deadline) index that
+        stops after `limit` rows; the sorted per-status lists are merged here.
+        """
+        now = datetime.utcnow()
+        per_status = []
+        for status in (TaskStatus.TODO, TaskStatus.DOING):
+            query = self.session.query(Task).filter(Task.status == status, Task.deadline >= now)
+            if until is not None:
+                query = query.filter(Task.deadline <= until)
+            if project_id:
+                query = query.filter(Task.project_id == project_id)
+            per_status.append(query.order_by(Task.deadline, Task.id).limit(limit).all())
+        return list(itertools.islice(heapq.merge(*per_status, key=lambda task: (task.deadline, task.id)), limit))
     
     def get_overdue_tasks(self) -> List[Task]:
-        return self.session.query(Task).filter(
+        # Closing never reads the description, so leave it out of the row load
+        return self.session.query(Task).options(defer(Task.description)).filter(
             and_(
                 Task.deadline < datetime.utcnow(),
                 Task.status != TaskStatus.DONE
@@ -78,3 +317,138 @@ class TaskRepository(BaseRepository[Task]):
             self.commit()
         
         return closed_count
+    
+    def get_archived_by_id(self, id: str) -> Optional[TaskArchive]:
+        return self.session.query(TaskArchive).filter(TaskArchive.id == id).first()
+    
+    def get_archived(self, project_id: Optional[str] = None) -> List[TaskArchive]:
+        query = self.session.query(TaskArchive)
+        if project_id:
+            query = query.filter(TaskArchive.project_id == project_id)
+        return query.order_by(TaskArchive.created_at).all()
+    
+    def archive_closed_before(self, cutoff: datetime, chunk_size: Optional[int] = None) -> int:
+        chunk_size = chunk_size or Config.BULK_OPERATION_CHUNK_SIZE
+        columns = ["id", "project_id", "title", "description", "status", "deadline", "created_at", "closed_at", "version"]
+        archived_at = datetime.utcnow()
+        archived_count = 0
+        
+        while True:
+            ids = [
+                row[0] for row in self.session.query(Task.id).filter(
+                    Task.status == TaskStatus.DONE,
+                    Task.closed_at < cutoff
+                ).limit(chunk_size)
+            ]
+            if not ids:
+                break
+            
+            # Copy and delete in the same transaction so a chunk is never half-moved
+            try:
+                self.session.execute(
+                    insert(TaskArchive).from_select(
+                        columns + ["archived_at"],
+                        select(*[getattr(Task, name) for name in columns], literal(archived_at))
+                        .where(Task.id.in_(ids))
+                    )
+                )
+                self.session.execute(
+                    delete(Task)
+                    .where(Task.id.in_(ids))
+                    .execution_options(synchronize_session=False)
+                )
+            except Exception:
+                self.session.rollback()
+                raise
+            self.commit()
+            archived_count += len(ids)
+        
+        return archived_count
+    
+    def bulk_update_status(
+        self,
+        new_status: str,
+        task_ids: Optional[List[str]] = None,
+        project_id: Optional[str] = None,
+        status: Optional[str] = None,
+        deadline_from: Optional[datetime] = None,
+        deadline_to: Optional[datetime] = None,
+        chunk_size: Optional[int] = None
+    ) -> int:
+        conditions = self._bulk_conditions(project_id, status, deadline_from, deadline_to)
+        values = _next_version(status_update_values(new_status))
+        
+        updated_count = 0
+        for ids in self._iter_id_chunks(task_ids, conditions, chunk_size):
+            result = self.session.execute(
+                update(Task)
+                .where(Task.id.in_(ids), *conditions)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            self.commit()
+            updated_count += result.rowcount
+        
+        return updated_count
+    
+    def bulk_delete(
+        self,
+        task_ids: Optional[List[str]] = None,
+        project_id: Optional[str] = None,
+        status: Optional[str] = None,
+        deadline_from: Optional[datetime] = None,
+        deadline_to: Optional[datetime] = None,
+        chunk_size: Optional[int] = None
+    ) -> int:
+        conditions = self._bulk_conditions(project_id, status, deadline_from, deadline_to)
+        
+        deleted_count = 0
+        for ids in self._iter_id_chunks(task_ids, conditions, chunk_size):
+            result = self.session.execute(
+                delete(Task)
+                .where(Task.id.in_(ids), *conditions)
+                .execution_options(synchronize_session=False)
+            )
+            self.commit()
+            deleted_count += result.rowcount
+        
+        return deleted_count
+    
+    def _bulk_conditions(
+        self,
+        project_id: Optional[str],
+        status: Optional[str],
+        deadline_from: Optional[datetime],
+        deadline_to: Optional[datetime]
+    ) -> list:
+        conditions = []
+        if project_id:
+            conditions.append(Task.project_id == project_id)
+        if status:
+            conditions.append(Task.status == status)
+        if deadline_from:
+            conditions.append(Task.deadline >= deadline_from)
+        if deadline_to:
+            conditions.append(Task.deadline <= deadline_to)
+        return conditions
+    
+    def _iter_id_chunks(self, task_ids: Optional[List[str]], conditions: list, chunk_size: Optional[int]) -> Iterator[List[str]]:
+        chunk_size = chunk_size or Config.BULK_OPERATION_CHUNK_SIZE
+        
+        if task_ids is not None:
+            unique_ids = list(dict.fromkeys(task_ids))
+            for start in range(0, len(unique_ids), chunk_size):
+                yield unique_ids[start:start + chunk_size]
+            return
+        
+        # Keyset pagination on the primary key so each chunk is an index range scan
+        last_id = None
+        while True:
+            query = self.session.query(Task.id).filter(*conditions)
+            if last_id is not None:
+                query = query.filter(Task.id > last_id)
+            ids = [row[0] for row in query.order_by(Task.id).limit(chunk_size)]
+            if not ids:
+                return
+            yield ids
+            last_id = ids[-1]
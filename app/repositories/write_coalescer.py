@@ -0,0 +1,123 @@
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+from sqlalchemy import update
+from app.db.session import db_session
+from app.models.task import Task
+from config import Config
+
+_STOP = object()
+
+class TaskWriteCoalescer:
+    """Applies bursts of single-task updates in one transaction with one commit.
+
+    Callers submit (task_id, values) and get a Future that resolves to True when
+    the row was updated or False when no task has that id. If the shared
+    transaction fails, every operation in the batch is retried in its own
+    transaction so each caller still gets its own outcome.
+    """
+
+    def __init__(self, window_ms: Optional[int] = None, max_batch: Optional[int] = None):
+        self.window = (window_ms if window_ms is not None else Config.WRITE_COALESCING_WINDOW_MS) / 1000
+        self.max_batch = max_batch or Config.WRITE_COALESCING_MAX_BATCH
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def submit(self, task_id: str, values: dict) -> Future:
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((task_id, values, future))
+        return future
+
+    def close(self):
+        with self._lock:
+            if self._worker is None:
+                return
+            self._queue.put(_STOP)
+            self._worker.join()
+            self._worker = None
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="task-write-coalescer", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch = [first]
+            stop = False
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    operation = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if operation is _STOP:
+                    stop = True
+                    break
+                batch.append(operation)
+
+            self._apply(batch)
+            if stop:
+                return
+
+    def _apply(self, batch: List[Tuple[str, dict, Future]]):
+        session = db_session.get_session()
+        try:
+            results = [self._execute(session, task_id, values) for task_id, values, _ in batch]
+            session.commit()
+        except Exception:
+            session.rollback()
+            session.close()
+            self._apply_individually(batch)
+            return
+        session.close()
+
+        for (_, _, future), updated in zip(batch, results):
+            future.set_result(updated)
+
+    def _apply_individually(self, batch: List[Tuple[str, dict, Future]]):
+        for task_id, values, future in batch:
+            session = db_session.get_session()
+            try:
+                updated = self._execute(session, task_id, values)
+                session.commit()
+                future.set_result(updated)
+            except Exception as e:
+                session.rollback()
+                future.set_exception(e)
+            finally:
+                session.close()
+
+    @staticmethod
+    def _execute(session, task_id: str, values: dict) -> bool:
+        result = session.execute(
+            update(Task)
+            .where(Task.id == task_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
+_coalescer = None
+_coalescer_lock = threading.Lock()
+
+def get_task_write_coalescer() -> TaskWriteCoalescer:
+    global _coalescer
+    with _coalescer_lock:
+        if _coalescer is None:
+            _coalescer = TaskWriteCoalescer()
+            atexit.register(_coalescer.close)
+        return _coalescer
@@ -0,0 +1,40 @@
+import json
+from typing import Optional, Tuple
+from app.models.job import Job, JobType
+from app.repositories.job_repository import JobRepository
+from app.repositories.project_repository import ProjectRepository
+from app.exceptions.repository_exceptions import ProjectNotFoundException
+
+class JobService:
+    def __init__(self, job_repository: JobRepository, project_repository: ProjectRepository):
+        self.job_repository = job_repository
+        self.project_repository = project_repository
+    
+    def enqueue(self, job_type: str, payload: dict, dedupe_key: Optional[str] = None) -> Job:
+        if dedupe_key:
+            existing = self.job_repository.get_active_by_dedupe_key(dedupe_key)
+            if existing:
+                return existing
+        
+        job = Job(type=job_type, payload=json.dumps(payload), dedupe_key=dedupe_key)
+        return self.job_repository.create(job)
+    
+    def enqueue_project_delete(self, project_id: str) -> Tuple[bool, str | Job]:
+        try:
+            if not self.project_repository.get_by_id(project_id):
+                raise ProjectNotFoundException("Project not found")
+            
+            job = self.enqueue(
+                JobType.DELETE_PROJECT,
+                {"project_id": project_id},
+                dedupe_key=f"{JobType.DELETE_PROJECT}:{project_id}"
+            )
+            return True, job
+        
+        except ProjectNotFoundException as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Unexpected error: {str(e)}"
+    
+    def get_job(self, job_id: str) -> Optional[Job]:
+        return self.job_repository.get_by_id(job_id)
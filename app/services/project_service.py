@@ -1,10 +1,12 @@
-from typing import List, Tuple
+from typing import Iterator, List, Optional, Tuple
 from app.models.project import Project
 from app.repositories.project_repository import ProjectRepository
 from app.exceptions.service_exceptions import ValidationException, BusinessRuleException
 from app.exceptions.repository_exceptions import ProjectNotFoundException, DuplicateProjectException
 from config import Config
+from app.tracing.tracer import traced_class
 
+@traced_class("service")
 class ProjectService:
     def __init__(self, project_repository: ProjectRepository):
         self.project_repository = project_repository
@@ -37,10 +39,6 @@ class ProjectService:
     
     def edit_project(self, project_id: str, name: str, description: str = "") -> Tuple[bool, str]:
         try:
-            project = self.project_repository.get_by_id(project_id)
-            if not project:
-                raise ProjectNotFoundException("Project not found")
-            
             # Validation
             if not name.strip():
                 raise ValidationException("Project name cannot be empty")
@@ -51,12 +49,10 @@ class ProjectService:
             if len(description) > Config.MAX_PROJECT_DESCRIPTION_LENGTH:
                 raise ValidationException(f"Project description cannot exceed {Config.MAX_PROJECT_DESCRIPTION_LENGTH} characters")
             
-            # Update project
-            project.name = name
-            project.description = description
-            updated_project = self.project_repository.update(project)
+            # One UPDATE ... RETURNING; the unique name constraint catches duplicates
+            self.project_repository.update_returning(project_id, {"name": name, "description": description})
             
-            return True, f"Project '{updated_project.name}' updated successfully"
+            return True, f"Project '{name}' updated successfully"
         
         except (ValidationException, BusinessRuleException, ProjectNotFoundException, DuplicateProjectException) as e:
             return False, str(e)
@@ -76,8 +72,14 @@ class ProjectService:
     def list_projects(self) -> List[Project]:
         return self.project_repository.get_all()
     
+    def iter_projects(self, limit: Optional[int] = None, offset: int = 0) -> Iterator[Tuple[Project, int]]:
+        return self.project_repository.iter_with_task_counts(limit=limit, offset=offset)
+    
     def get_project_by_id(self, project_id: str):
         return self.project_repository.get_by_id(project_id)
     
     def get_project_by_name(self, name: str):
         return self.project_repository.get_by_name(name)
+    
+    def get_project_id_by_name(self, name: str):
+        return self.project_repository.get_id_by_name(name)
@@ -0,0 +1,130 @@
+import bisect
+import math
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from app.repositories.task_repository import TaskRepository
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.stats_cache import stats_cache
+from app.exceptions.repository_exceptions import ProjectNotFoundException
+from app.tracing.tracer import traced_class
+
+try:
+    import numpy as np
+except ImportError:  # Optional: `poetry install -E analytics`; the pure-Python path gives the same numbers
+    np = None
+
+# Upcoming-deadline histogram edges in days from now; the last bucket is open-ended
+DEADLINE_BUCKET_EDGES = (0, 1, 3, 7, 14, 30)
+
+def _bucket_labels() -> List[str]:
+    labels = [f"{low}-{high}d" for low, high in zip(DEADLINE_BUCKET_EDGES, DEADLINE_BUCKET_EDGES[1:])]
+    return labels + [f"{DEADLINE_BUCKET_EDGES[-1]}d+"]
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    # Linear interpolation between closest ranks, the same rule as numpy.percentile's default
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def cycle_time_hours(timestamps: List[Tuple[datetime, datetime]]) -> dict:
+    """Median, p90 and mean of closed_at - created_at, in hours."""
+    if not timestamps:
+        return {"samples": 0, "median_hours": None, "p90_hours": None, "mean_hours": None}
+
+    if np is not None:
+        created, closed = (np.array(column, dtype="datetime64[us]") for column in zip(*timestamps))
+        hours = (closed - created) / np.timedelta64(1, "h")
+        median, p90 = np.percentile(hours, [50, 90])
+        mean = hours.mean()
+    else:
+        hours = sorted((closed - created) / timedelta(hours=1) for created, closed in timestamps)
+        median, p90 = _percentile(hours, 50), _percentile(hours, 90)
+        mean = sum(hours) / len(hours)
+
+    return {
+        "samples": len(timestamps),
+        "median_hours": round(float(median), 2),
+        "p90_hours": round(float(p90), 2),
+        "mean_hours": round(float(mean), 2)
+    }
+
+def deadline_histogram(deadlines: List[datetime], now: datetime) -> Tuple[int, List[dict]]:
+    """(overdue count, per-bucket counts) of open deadlines by days remaining."""
+    if np is not None:
+        days_left = (np.array(deadlines, dtype="datetime64[us]") - np.datetime64(now, "us")) / np.timedelta64(1, "D")
+        overdue = int((days_left < 0).sum())
+        counts, _ = np.histogram(days_left[days_left >= 0], bins=[*DEADLINE_BUCKET_EDGES, np.inf])
+        counts = [int(count) for count in counts]
+    else:
+        overdue = 0
+        counts = [0] * len(DEADLINE_BUCKET_EDGES)
+        for deadline in deadlines:
+            days_left = (deadline - now) / timedelta(days=1)
+            if days_left < 0:
+                overdue += 1
+            else:
+                counts[bisect.bisect_right(DEADLINE_BUCKET_EDGES, days_left) - 1] += 1
+
+    return overdue, [{"label": label, "count": count} for label, count in zip(_bucket_labels(), counts)]
+
+@traced_class("service")
+class StatsService:
+    def __init__(self, task_repository: TaskRepository, project_repository: ProjectRepository):
+        self.task_repository = task_repository
+        self.project_repository = project_repository
+
+    def get_project_stats(self, project_id: str, days: int) -> Tuple[bool, str | dict]:
+        try:
+            if not self.project_repository.get_summary(project_id):
+                raise ProjectNotFoundException("Project not found")
+            return True, self._cached_stats(project_id, days)
+
+        except ProjectNotFoundException as e:
+            return False, str(e)
+
+    def get_organization_stats(self, days: int) -> dict:
+        return self._cached_stats(None, days)
+
+    def _cached_stats(self, project_id: Optional[str], days: int) -> dict:
+        stats = stats_cache.get(project_id, days)
+        if stats is None:
+            stats = self._compute_stats(project_id, days)
+            stats_cache.put(project_id, days, stats)
+        return stats
+
+    def _compute_stats(self, project_id: Optional[str], days: int) -> dict:
+        now = datetime.utcnow()
+        first_day = (now - timedelta(days=days - 1)).date()
+        since = datetime.combine(first_day, datetime.min.time())
+
+        # Counting and grouping happen in SQL; only closed/deadline timestamps come back as columns
+        created = dict(self.task_repository.count_by_day("created_at", since, project_id))
+        closed = dict(self.task_repository.count_by_day("closed_at", since, project_id))
+        daily = []
+        for offset in range(days):
+            day = (first_day + timedelta(days=offset)).isoformat()
+            daily.append({"date": day, "created": created.get(day, 0), "closed": closed.get(day, 0)})
+
+        closed_count, with_deadline, on_time = self.task_repository.count_deadline_outcomes(since, project_id)
+        late = with_deadline - on_time
+        overdue, upcoming = deadline_histogram(self.task_repository.get_open_deadlines(project_id), now)
+
+        return {
+            "project_id": project_id,
+            "days": days,
+            "generated_at": now,
+            "status_counts": self.task_repository.count_by_status(project_id),
+            "daily": daily,
+            "cycle_time": cycle_time_hours(self.task_repository.get_cycle_timestamps(since, project_id)),
+            "deadline_outcomes": {
+                "closed": closed_count,
+                "with_deadline": with_deadline,
+                "on_time": on_time,
+                "late": late,
+                "on_time_rate": round(on_time / with_deadline, 4) if with_deadline else None,
+                "late_rate": round(late / with_deadline, 4) if with_deadline else None
+            },
+            "overdue": overdue,
+            "upcoming_deadlines": upcoming
+        }
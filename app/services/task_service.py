@@ -1,12 +1,16 @@
-from typing import List, Tuple, Optional
-from datetime import datetime
+from typing import Iterator, List, Tuple, Optional
+from datetime import datetime, timedelta
 from app.models.task import Task, TaskStatus
-from app.repositories.task_repository import TaskRepository
+from app.models.task_archive import TaskArchive
+from app.repositories.task_repository import TaskRepository, status_update_values
 from app.repositories.project_repository import ProjectRepository
+from app.repositories.project_cache import project_cache
 from app.exceptions.service_exceptions import ValidationException, BusinessRuleException
 from app.exceptions.repository_exceptions import TaskNotFoundException, ProjectNotFoundException, DuplicateTaskException
 from config import Config
+from app.tracing.tracer import traced_class
 
+@traced_class("service")
 class TaskService:
     def __init__(self, task_repository: TaskRepository, project_repository: ProjectRepository):
         self.task_repository = task_repository
@@ -15,8 +19,8 @@ class TaskService:
     def create_task(self, project_name: str, title: str, description: str = "", deadline: Optional[datetime] = None) -> Tuple[bool, str]:
         try:
             # Get project
-            project = self.project_repository.get_by_name(project_name)
-            if not project:
+            project_id = self.project_repository.get_id_by_name(project_name, verify=True)
+            if not project_id:
                 raise ProjectNotFoundException("Project not found")
             
             # Validation
@@ -29,19 +33,24 @@ class TaskService:
             if len(description) > Config.MAX_TASK_DESCRIPTION_LENGTH:
                 raise ValidationException(f"Task description cannot exceed {Config.MAX_TASK_DESCRIPTION_LENGTH} characters")
             
-            if self.task_repository.count_by_project(project.id) >= Config.MAX_NUMBER_OF_TASKS:
+            if self.task_repository.count_by_project(project_id) >= Config.MAX_NUMBER_OF_TASKS:
                 raise BusinessRuleException(f"Cannot exceed maximum number of tasks per project: {Config.MAX_NUMBER_OF_TASKS}")
             
             # Create task
             task = Task(
-                project_id=project.id,
+                project_id=project_id,
                 title=title,
                 description=description,
                 deadline=deadline
             )
-            created_task = self.task_repository.create(task)
+            try:
+                created_task = self.task_repository.create(task)
+            except ProjectNotFoundException:
+                # The cached id belonged to a project deleted elsewhere
+                project_cache.invalidate(name=project_name)
+                raise ProjectNotFoundException("Project not found")
             
-            return True, f"Task '{created_task.title}' created successfully in project '{project.name}'"
+            return True, f"Task '{created_task.title}' created successfully in project '{project_name}'"
         
         except (ValidationException, BusinessRuleException, ProjectNotFoundException, DuplicateTaskException) as e:
             return False, str(e)
@@ -50,10 +59,6 @@ class TaskService:
     
     def edit_task(self, task_id: str, title: str, description: str = "", status: str = TaskStatus.TODO) -> Tuple[bool, str]:
         try:
-            task = self.task_repository.get_by_id(task_id)
-            if not task:
-                raise TaskNotFoundException("Task not found")
-            
             # Validation
             if not title.strip():
                 raise ValidationException("Task title cannot be empty")
@@ -69,18 +74,13 @@ class TaskService:
             if status not in valid_statuses:
                 raise ValidationException(f"Status must be one of: {', '.join(valid_statuses)}")
             
-            # Update task
-            task.title = title
-            task.description = description
-            task.status = status
-            
-            # If marking as done, set closed_at
-            if status == TaskStatus.DONE and not task.closed_at:
-                task.closed_at = datetime.utcnow()
-            
-            updated_task = self.task_repository.update(task)
+            # One UPDATE without loading the task; a missing task shows up as zero rows updated
+            values = status_update_values(status)
+            values.update(title=title, description=description)
+            if not self.task_repository.update_fields(task_id, values):
+                raise TaskNotFoundException("Task not found")
             
-            return True, f"Task '{updated_task.title}' updated successfully"
+            return True, f"Task '{title}' updated successfully"
         
         except (ValidationException, BusinessRuleException, TaskNotFoundException) as e:
             return False, str(e)
@@ -99,23 +99,13 @@ class TaskService:
     
     def change_task_status(self, task_id: str, status: str) -> Tuple[bool, str]:
         try:
-            task = self.task_repository.get_by_id(task_id)
-            if not task:
-                raise TaskNotFoundException("Task not found")
-            
             # Validate status
             valid_statuses = [TaskStatus.TODO, TaskStatus.DOING, TaskStatus.DONE]
             if status not in valid_statuses:
                 raise ValidationException(f"Status must be one of: {', '.join(valid_statuses)}")
             
-            # Update status
-            task.status = status
-            
-            # If marking as done, set closed_at
-            if status == TaskStatus.DONE and not task.closed_at:
-                task.closed_at = datetime.utcnow()
-            
-            self.task_repository.update(task)
+            if not self.task_repository.update_fields(task_id, status_update_values(status)):
+                raise TaskNotFoundException("Task not found")
             
             return True, f"Task status changed to '{status}'"
         
@@ -124,13 +114,80 @@ class TaskService:
         except Exception as e:
             return False, f"Unexpected error: {str(e)}"
     
+    def bulk_change_status(
+        self,
+        new_status: str,
+        task_ids: Optional[List[str]] = None,
+        project_id: Optional[str] = None,
+        status: Optional[str] = None,
+        deadline_from: Optional[datetime] = None,
+        deadline_to: Optional[datetime] = None
+    ) -> Tuple[bool, str | int]:
+        try:
+            valid_statuses = [TaskStatus.TODO, TaskStatus.DOING, TaskStatus.DONE]
+            if new_status not in valid_statuses:
+                raise ValidationException(f"Status must be one of: {', '.join(valid_statuses)}")
+            
+            self._validate_bulk_selection(task_ids, project_id, status, deadline_from, deadline_to)
+            
+            updated_count = self.task_repository.bulk_update_status(
+                new_status,
+                task_ids=task_ids,
+                project_id=project_id,
+                status=status,
+                deadline_from=deadline_from,
+                deadline_to=deadline_to
+            )
+            return True, updated_count
+        
+        except ValidationException as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Unexpected error: {str(e)}"
+    
+    def bulk_delete_tasks(
+        self,
+        task_ids: Optional[List[str]] = None,
+        project_id: Optional[str] = None,
+        status: Optional[str] = None,
+        deadline_from: Optional[datetime] = None,
+        deadline_to: Optional[datetime] = None
+    ) -> Tuple[bool, str | int]:
+        try:
+            self._validate_bulk_selection(task_ids, project_id, status, deadline_from, deadline_to)
+            
+            deleted_count = self.task_repository.bulk_delete(
+                task_ids=task_ids,
+                project_id=project_id,
+                status=status,
+                deadline_from=deadline_from,
+                deadline_to=deadline_to
+            )
+            return True, deleted_count
+        
+        except ValidationException as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Unexpected error: {str(e)}"
+    
+    def _validate_bulk_selection(self, task_ids, project_id, status, deadline_from, deadline_to):
+        # An empty selection would touch every task, which is never what a caller means
+        if task_ids is None and not any([project_id, status, deadline_from, deadline_to]):
+            raise ValidationException("Provide task_ids or at least one filter")
+        
+        if status and status not in [TaskStatus.TODO, TaskStatus.DOING, TaskStatus.DONE]:
+            raise ValidationException("Status filter must be one of: todo, doing, done")
+        
+        if deadline_from and deadline_to and deadline_from > deadline_to:
+            raise ValidationException("deadline_from must not be after deadline_to")
+    
     def list_tasks_by_project(self, project_name: str) -> Tuple[bool, str | List[Task]]:
         try:
-            project = self.project_repository.get_by_name(project_name)
-            if not project:
+            project_id = self.project_repository.get_id_by_name(project_name)
+            if not project_id:
                 raise ProjectNotFoundException("Project not found")
             
-            tasks = self.task_repository.get_by_project_id(project.id)
+            tasks = self.task_repository.get_by_project_id(project_id)
             return True, tasks
         
         except ProjectNotFoundException as e:
@@ -138,12 +195,52 @@ class TaskService:
         except Exception as e:
             return False, f"Unexpected error: {str(e)}"
     
+    def iter_tasks(
+        self,
+        project_name: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> Tuple[bool, str | Iterator[Task]]:
+        try:
+            project_id = None
+            if project_name:
+                project_id = self.project_repository.get_id_by_name(project_name)
+                if not project_id:
+                    raise ProjectNotFoundException("Project not found")
+            
+            return True, self.task_repository.iter_all(project_id=project_id, limit=limit, offset=offset)
+        
+        except ProjectNotFoundException as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Unexpected error: {str(e)}"
+    
+    def iter_overdue_tasks(self, limit: Optional[int] = None, offset: int = 0) -> Iterator[Task]:
+        return self.task_repository.iter_overdue_tasks(limit=limit, offset=offset)
+    
     def list_all_tasks(self) -> List[Task]:
         return self.task_repository.get_all()
     
     def get_overdue_tasks(self) -> List[Task]:
         return self.task_repository.get_overdue_tasks()
     
+    def list_archived_tasks(self, project_id: Optional[str] = None) -> List[TaskArchive]:
+        return self.task_repository.get_archived(project_id)
+    
+    def archive_closed_tasks(self, retention_days: Optional[int] = None) -> Tuple[bool, str]:
+        try:
+            if retention_days is None:
+                retention_days = Config.TASK_ARCHIVE_RETENTION_DAYS
+            if retention_days <= 0:
+                return True, "Task archiving is disabled"
+            
+            cutoff = datetime.utcnow() - timedelta(days=retention_days)
+            archived_count = self.task_repository.archive_closed_before(cutoff)
+            return True, f"Archived {archived_count} tasks closed before {cutoff.strftime('%Y-%m-%d')}"
+        
+        except Exception as e:
+            return False, f"Error archiving closed tasks: {str(e)}"
+    
     def close_overdue_tasks(self) -> Tuple[bool, str]:
         try:
             closed_count = self.task_repository.close_overdue_tasks()
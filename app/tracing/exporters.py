@@ -0,0 +1,137 @@
+import json
+import queue
+import threading
+import urllib.request
+from typing import List
+from config import Config
+
+_STOP = object()
+
+def _attribute(key: str, value) -> dict:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+def to_otlp(spans: List, service_name: str) -> dict:
+    """Encode finished spans as an OTLP/JSON ExportTraceServiceRequest."""
+    encoded = []
+    for span in spans:
+        item = {
+            "traceId": span.context.trace_id,
+            "spanId": span.context.span_id,
+            "name": span.name,
+            "kind": span.kind,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [_attribute(key, value) for key, value in span.attributes.items()],
+            "status": {"code": span.status}
+        }
+        if span.parent_span_id:
+            item["parentSpanId"] = span.parent_span_id
+        if span.status_message:
+            item["status"]["message"] = span.status_message
+        encoded.append(item)
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", service_name)]},
+            "scopeSpans": [{"scope": {"name": "app.tracing"}, "spans": encoded}]
+        }]
+    }
+
+class FileSpanExporter:
+    """Appends one OTLP/JSON request per line; a local stand-in for a collector."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, payload: dict):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(payload) + "\n")
+
+class OtlpHttpSpanExporter:
+    """POSTs OTLP/JSON to a collector's /v1/traces endpoint."""
+
+    def __init__(self, endpoint: str, timeout: float = 5):
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def export(self, payload: dict):
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+class BatchSpanProcessor:
+    """Exports spans from a background thread so requests never wait on the exporter.
+
+    When the queue is full new spans are dropped and counted rather than blocking.
+    """
+
+    def __init__(self, exporter, service_name: str, max_queue: int = 2048, max_batch: int = 512,
+                 flush_interval: float = 1.0):
+        self.exporter = exporter
+        self.service_name = service_name
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._worker = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._worker.start()
+
+    def on_end(self, span):
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def shutdown(self, timeout: float = 5):
+        self._queue.put(_STOP)
+        self._worker.join(timeout)
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            if first is _STOP:
+                return
+
+            batch = [first]
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    span = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if span is _STOP:
+                    stop = True
+                    break
+                batch.append(span)
+
+            self._export(batch)
+            if stop:
+                return
+
+    def _export(self, batch: List):
+        try:
+            self.exporter.export(to_otlp(batch, self.service_name))
+        except Exception:
+            # Tracing must never take the application down; the batch is lost
+            self.dropped += len(batch)
+
+def create_span_processor() -> BatchSpanProcessor:
+    if Config.TRACING_EXPORTER == "otlp":
+        exporter = OtlpHttpSpanExporter(Config.TRACING_OTLP_ENDPOINT)
+    else:
+        exporter = FileSpanExporter(Config.TRACING_FILE_PATH)
+    return BatchSpanProcessor(exporter, Config.TRACING_SERVICE_NAME)
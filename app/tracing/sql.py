@@ -0,0 +1,39 @@
+from sqlalchemy import event
+from app.tracing.tracer import SPAN_KIND_CLIENT, tracer
+
+_MAX_STATEMENT_LENGTH = 1000
+
+def instrument_engine(engine):
+    """Record a client span per SQL statement executed inside an active span."""
+    system = engine.dialect.name
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_statement_span(conn, cursor, statement, parameters, context, executemany):
+        if tracer.current_span() is None:
+            # Statements outside a traced operation would each start their own trace
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+        span = tracer.start_span(
+            f"SQL {operation}",
+            SPAN_KIND_CLIENT,
+            attributes={"db.system": system, "db.statement": statement[:_MAX_STATEMENT_LENGTH]}
+        )
+        conn.info.setdefault("trace_spans", []).append(span)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def end_statement_span(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("trace_spans")
+        if spans:
+            span = spans.pop()
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                span.set_attribute("db.rowcount", cursor.rowcount)
+            span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def fail_statement_span(exception_context):
+        conn = exception_context.connection
+        spans = conn.info.get("trace_spans") if conn is not None else None
+        if spans:
+            span = spans.pop()
+            span.record_exception(exception_context.original_exception)
+            span.end()
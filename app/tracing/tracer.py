@@ -0,0 +1,184 @@
+import atexit
+import contextvars
+import functools
+import inspect
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from config import Config
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+_TRACEPARENT = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})(-.*)?$")
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+class SpanContext:
+    __slots__ = ("trace_id", "span_id", "sampled")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+
+def parse_traceparent(header: Optional[str]) -> Optional[SpanContext]:
+    """Parse a W3C traceparent header; anything malformed starts a new trace."""
+    if not header:
+        return None
+    match = _TRACEPARENT.match(header.strip().lower())
+    if not match:
+        return None
+    version, trace_id, span_id, flags, rest = match.groups()
+    if version == "ff" or (version == "00" and rest) or set(trace_id) == {"0"} or set(span_id) == {"0"}:
+        return None
+    return SpanContext(trace_id, span_id, bool(int(flags, 16) & 1))
+
+def format_traceparent(context: SpanContext) -> str:
+    return f"00-{context.trace_id}-{context.span_id}-{'01' if context.sampled else '00'}"
+
+class Span:
+    __slots__ = ("tracer", "name", "context", "parent_span_id", "kind", "attributes",
+                 "start_ns", "end_ns", "status", "status_message")
+
+    def __init__(self, tracer: "Tracer", name: str, context: SpanContext, parent_span_id: Optional[str],
+                 kind: int, attributes: Optional[Dict] = None):
+        self.tracer = tracer
+        self.name = name
+        self.context = context
+        self.parent_span_id = parent_span_id
+        self.kind = kind
+        self.attributes = dict(attributes) if attributes else {}
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = STATUS_UNSET
+        self.status_message = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException):
+        self.status = STATUS_ERROR
+        self.status_message = str(exc)
+        self.attributes["exception.type"] = type(exc).__name__
+
+    def end(self):
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if self.context.sampled:
+            self.tracer.export(self)
+
+class Tracer:
+    """Creates spans and hands sampled ones to a background exporter.
+
+    Sampling is decided once per trace at the root (TRACING_SAMPLE_RATIO) and
+    inherited by every child, including traces continued from a traceparent.
+    """
+
+    def __init__(self, enabled: bool, sample_ratio: float):
+        self.enabled = enabled
+        self.sample_ratio = sample_ratio
+        self._processor = None
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, kind: int = SPAN_KIND_INTERNAL, parent: Optional[SpanContext] = None,
+                   attributes: Optional[Dict] = None) -> Span:
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current is not None else None
+
+        if parent is not None:
+            context = SpanContext(parent.trace_id, _random_id(8), parent.sampled)
+            parent_span_id = parent.span_id
+        else:
+            context = SpanContext(_random_id(16), _random_id(8), random.random() < self.sample_ratio)
+            parent_span_id = None
+        return Span(self, name, context, parent_span_id, kind, attributes)
+
+    @contextmanager
+    def span(self, name: str, kind: int = SPAN_KIND_INTERNAL, parent: Optional[SpanContext] = None, **attributes):
+        if not self.enabled:
+            yield None
+            return
+
+        span = self.start_span(name, kind, parent, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get()
+
+    def export(self, span: Span):
+        if self._processor is None:
+            with self._lock:
+                if self._processor is None:
+                    from app.tracing.exporters import create_span_processor
+                    self._processor = create_span_processor()
+        self._processor.on_end(span)
+
+    def shutdown(self):
+        with self._lock:
+            processor, self._processor = self._processor, None
+        if processor is not None:
+            processor.shutdown()
+
+    def reset_after_fork(self):
+        # The exporter thread does not survive fork; the child starts its own on first use
+        self._processor = None
+        self._lock = threading.Lock()
+
+def _random_id(size: int) -> str:
+    return random.getrandbits(size * 8).to_bytes(size, "big").hex()
+
+tracer = Tracer(Config.TRACING_ENABLED, Config.TRACING_SAMPLE_RATIO)
+atexit.register(tracer.shutdown)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=tracer.reset_after_fork)
+
+def current_traceparent() -> Optional[str]:
+    """traceparent value for outgoing calls made inside the current span."""
+    span = _current_span.get()
+    return format_traceparent(span.context) if span is not None else None
+
+def traced(name: Optional[str] = None, layer: Optional[str] = None):
+    """Wrap a function in a span; with tracing disabled it costs one attribute check."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+        attributes = {"app.layer": layer} if layer else {}
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def traced_class(layer: str):
+    """Trace every public method defined on the class; a no-op when tracing is disabled."""
+    def decorator(cls):
+        if not tracer.enabled:
+            return cls
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_") or not inspect.isfunction(value):
+                continue
+            setattr(cls, attr, traced(f"{cls.__name__}.{attr}", layer)(value))
+        return cls
+    return decorator
@@ -6,6 +6,47 @@ load_dotenv()
 class Config:
     # Database
     DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///todolist.db')
+    # Comma-separated read replicas; reads fall back to the primary when none are healthy
+    DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    REPLICA_HEALTH_CHECK_SECONDS = int(os.getenv('REPLICA_HEALTH_CHECK_SECONDS', '30'))
+    
+    # SQLite production profile: WAL, relaxed fsync, mmap and a separate read pool
+    SQLITE_PROFILE_ENABLED = os.getenv('SQLITE_PROFILE_ENABLED', 'true').lower() == 'true'
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+    SQLITE_MMAP_SIZE_MB = int(os.getenv('SQLITE_MMAP_SIZE_MB', '256'))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', '65536'))
+    SQLITE_READ_POOL_SIZE = int(os.getenv('SQLITE_READ_POOL_SIZE', '4'))
+    # WAL checkpoint and PRAGMA optimize from the scheduler (0 disables)
+    SQLITE_MAINTENANCE_INTERVAL_MINUTES = int(os.getenv('SQLITE_MAINTENANCE_INTERVAL_MINUTES', '60'))
+    
+    # API server
+    API_HOST = os.getenv('API_HOST', '0.0.0.0')
+    API_PORT = int(os.getenv('API_PORT', '8001'))
+    API_WORKERS = int(os.getenv('API_WORKERS', '1'))
+    API_GRACEFUL_SHUTDOWN_SECONDS = int(os.getenv('API_GRACEFUL_SHUTDOWN_SECONDS', '30'))
+    
+    # Admission control and load shedding (per API worker)
+    ADMISSION_CONTROL_ENABLED = os.getenv('ADMISSION_CONTROL_ENABLED', 'true').lower() == 'true'
+    ADMISSION_MAX_CONCURRENCY = int(os.getenv('ADMISSION_MAX_CONCURRENCY', '10'))
+    ADMISSION_MAX_QUEUE = int(os.getenv('ADMISSION_MAX_QUEUE', '50'))
+    ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv('ADMISSION_QUEUE_TIMEOUT_SECONDS', '2'))
+    ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv('ADMISSION_RETRY_AFTER_SECONDS', '1'))
+    # Server-side statement timeout in milliseconds, PostgreSQL only (0 disables)
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '10000'))
+    
+    # SQL compiled-statement cache entries per engine, and psycopg 3 server-side
+    # prepare after N executions of a statement (0 prepares immediately, -1 disables)
+    DB_COMPILED_CACHE_SIZE = int(os.getenv('DB_COMPILED_CACHE_SIZE', '500'))
+    DB_PREPARE_THRESHOLD = int(os.getenv('DB_PREPARE_THRESHOLD', '5'))
+    
+    # Single-flight: identical concurrent GETs share one execution
+    SINGLE_FLIGHT_ENABLED = os.getenv('SINGLE_FLIGHT_ENABLED', 'true').lower() == 'true'
+    SINGLE_FLIGHT_WAIT_SECONDS = float(os.getenv('SINGLE_FLIGHT_WAIT_SECONDS', '5'))
+    
+    # Idempotency keys for create/close endpoints
+    IDEMPOTENCY_TTL_HOURS = int(os.getenv('IDEMPOTENCY_TTL_HOURS', '24'))
+    IDEMPOTENCY_WAIT_SECONDS = float(os.getenv('IDEMPOTENCY_WAIT_SECONDS', '10'))
+    IDEMPOTENCY_POLL_INTERVAL_SECONDS = float(os.getenv('IDEMPOTENCY_POLL_INTERVAL_SECONDS', '0.05'))
     
     # Project limits
     MAX_PROJECT_NAME_LENGTH = int(os.getenv('MAX_PROJECT_NAME_LENGTH', '30'))
@@ -17,6 +58,65 @@ class Config:
     
     # Auto-close settings
     AUTO_CLOSE_INTERVAL_MINUTES = int(os.getenv('AUTO_CLOSE_INTERVAL_MINUTES', '15'))
+    # Run auto-close inside each API worker process (use with a single worker, or 'main.py --auto-close')
+    API_AUTO_CLOSE_ENABLED = os.getenv('API_AUTO_CLOSE_ENABLED', 'false').lower() == 'true'
+    
+    # Bulk operations
+    BULK_OPERATION_CHUNK_SIZE = int(os.getenv('BULK_OPERATION_CHUNK_SIZE', '500'))
+    
+    # Rows fetched per round trip when streaming list output
+    STREAM_CHUNK_SIZE = int(os.getenv('STREAM_CHUNK_SIZE', '500'))
+    
+    # Background jobs (worker threads per API process; 0 leaves jobs to 'cli jobs-worker')
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+    JOB_POLL_INTERVAL_SECONDS = float(os.getenv('JOB_POLL_INTERVAL_SECONDS', '1'))
+    # A running job whose worker has not renewed its lease for this long is re-queued (the worker died)
+    JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', '300'))
+    
+    # Archive settings (retention of 0 disables archiving)
+    TASK_ARCHIVE_RETENTION_DAYS = int(os.getenv('TASK_ARCHIVE_RETENTION_DAYS', '90'))
+    TASK_ARCHIVE_INTERVAL_HOURS = int(os.getenv('TASK_ARCHIVE_INTERVAL_HOURS', '24'))
+    
+    # PostgreSQL hash partitioning of tasks by project_id (0 keeps a plain table)
+    TASK_PARTITION_COUNT = int(os.getenv('TASK_PARTITION_COUNT', '0'))
+    
+    # Group commit for single-task updates (status changes and edits)
+    WRITE_COALESCING_ENABLED = os.getenv('WRITE_COALESCING_ENABLED', 'false').lower() == 'true'
+    WRITE_COALESCING_WINDOW_MS = int(os.getenv('WRITE_COALESCING_WINDOW_MS', '5'))
+    WRITE_COALESCING_MAX_BATCH = int(os.getenv('WRITE_COALESCING_MAX_BATCH', '100'))
+    
+    # Project name/id cache (per process)
+    PROJECT_CACHE_MAX_SIZE = int(os.getenv('PROJECT_CACHE_MAX_SIZE', '1024'))
+    PROJECT_CACHE_TTL_SECONDS = float(os.getenv('PROJECT_CACHE_TTL_SECONDS', '60'))
+    
+    # Tracing (spans exported as OTLP/JSON to a file or a collector at TRACING_OTLP_ENDPOINT)
+    TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'false').lower() == 'true'
+    TRACING_SAMPLE_RATIO = float(os.getenv('TRACING_SAMPLE_RATIO', '1.0'))
+    TRACING_EXPORTER = os.getenv('TRACING_EXPORTER', 'file')
+    TRACING_FILE_PATH = os.getenv('TRACING_FILE_PATH', 'traces.jsonl')
+    TRACING_OTLP_ENDPOINT = os.getenv('TRACING_OTLP_ENDPOINT', 'http://localhost:4318/v1/traces')
+    TRACING_SERVICE_NAME = os.getenv('TRACING_SERVICE_NAME', 'todolist')
+    
+    # On-demand profiling of single requests (X-Profile: cpu|sample|memory plus X-Admin-Token)
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'
+    PROFILING_ADMIN_TOKEN = os.getenv('PROFILING_ADMIN_TOKEN', '')
+    PROFILING_DIR = os.getenv('PROFILING_DIR', 'profiles')
+    PROFILING_MAX_PER_HOUR = int(os.getenv('PROFILING_MAX_PER_HOUR', '6'))
+    PROFILING_MAX_FILES = int(os.getenv('PROFILING_MAX_FILES', '50'))
+    PROFILING_SAMPLE_INTERVAL_MS = int(os.getenv('PROFILING_SAMPLE_INTERVAL_MS', '5'))
+    PROFILING_TRACEMALLOC_FRAMES = int(os.getenv('PROFILING_TRACEMALLOC_FRAMES', '10'))
+    
+    # Project/org stats reports; task writes in this process invalidate them immediately
+    STATS_CACHE_TTL_SECONDS = float(os.getenv('STATS_CACHE_TTL_SECONDS', '300'))
+    
+    # Typeahead (/projects/suggest, /tasks/suggest): in-memory prefix index per process;
+    # tables larger than the cap are served by the lower(name) database index instead
+    SUGGEST_INDEX_ENABLED = os.getenv('SUGGEST_INDEX_ENABLED', 'true').lower() == 'true'
+    SUGGEST_INDEX_MAX_ENTRIES = int(os.getenv('SUGGEST_INDEX_MAX_ENTRIES', '100000'))
+    SUGGEST_INDEX_TTL_SECONDS = float(os.getenv('SUGGEST_INDEX_TTL_SECONDS', '60'))
+    
+    # Upper bound on tasks embedded per project with ?include=tasks
+    PROJECT_INCLUDE_MAX_TASKS = int(os.getenv('PROJECT_INCLUDE_MAX_TASKS', '100'))
     
     # Validation messages
     @staticmethod
@@ -1,42 +1,44 @@
 #!/usr/bin/env python3
+import os
 import sys
 
-def run_api():
-    from fastapi import FastAPI
+def run_api(argv=None):
+    import argparse
     import uvicorn
+    from config import Config
     
-    app = FastAPI(
-        title="ToDoList API",
-        version="1.0.0",
-        description="API for managing ToDoList projects and tasks",
-        docs_url="/docs",
-        redoc_url="/redoc"
-    )
-    
-    # Import routers here to avoid circular imports at module level
-    from app.api.routers import api_router
-    app.include_router(api_router, prefix="/api/v1")
+    parser = argparse.ArgumentParser(description="Run the ToDoList API server")
+    parser.add_argument("--host", default=Config.API_HOST)
+    parser.add_argument("--port", type=int, default=Config.API_PORT)
+    parser.add_argument("--workers", type=int, default=Config.API_WORKERS,
+                        help="Number of worker processes (0 = one per CPU core)")
+    parser.add_argument("--auto-close", action="store_true", default=Config.API_AUTO_CLOSE_ENABLED,
+                        help="Run auto-close of overdue tasks inside the API (no separate scheduler)")
+    args = parser.parse_args(argv)
     
-    @app.get("/")
-    def root():
-        return {
-            "message": "Welcome to ToDoList API",
-            "docs": "/docs",
-            "redoc": "/redoc",
-            "note": "CLI is deprecated. Use API endpoints instead."
-        }
-    
-    @app.get("/health")
-    def health_check():
-        return {"status": "healthy"}
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    # A single worker shares this process's Config; spawned workers read the environment
+    Config.API_AUTO_CLOSE_ENABLED = args.auto_close
+    os.environ["API_AUTO_CLOSE_ENABLED"] = "true" if args.auto_close else "false"
     
     print("=" * 60)
     print("Starting ToDoList API server...")
-    print("API Documentation: http://localhost:8001/docs")
+    print(f"API Documentation: http://{args.host}:{args.port}/docs")
+    print(f"Workers: {workers}")
+    if args.auto_close:
+        print(f"Auto-close: every {Config.AUTO_CLOSE_INTERVAL_MINUTES} minutes in each worker")
     print("CLI is deprecated. Please use the API instead.")
     print("=" * 60)
     
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    # Workers build the app (and their own engine pools) from the factory
+    uvicorn.run(
+        "app.api.factory:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        timeout_graceful_shutdown=Config.API_GRACEFUL_SHUTDOWN_SECONDS
+    )
 
 def run_cli():
     """Run CLI (deprecated)"""
@@ -48,6 +50,11 @@ def run_cli():
     from app.repositories.task_repository import TaskRepository
     from app.db.session import db_session
     from app.commands.autoclose_overdue import autoclose_overdue
+    from app.commands.archive_closed import archive_closed
+    from app.commands.explain_partitions import explain_partitions
+    from app.commands.job_worker import job_worker
+    from app.commands.partition_tasks import partition_tasks
+    from app.commands.snapshot import restore_snapshot_command, snapshot
     from app.commands.scheduler import run_scheduler
     
     @click.group()
@@ -74,6 +81,13 @@ def run_cli():
         """Auto close overdue tasks (deprecated)"""
         autoclose_overdue()
     
+    cli.add_command(archive_closed, name="archive")
+    cli.add_command(explain_partitions, name="explain-partitions")
+    cli.add_command(job_worker, name="jobs-worker")
+    cli.add_command(partition_tasks, name="partition-tasks")
+    cli.add_command(snapshot, name="snapshot")
+    cli.add_command(restore_snapshot_command, name="restore-snapshot")
+    
     @cli.command()
     def scheduler():
         run_scheduler()
@@ -93,13 +107,13 @@ def run_cli():
         print("1. create_project <name> <description>")
         print("2. edit_project <project_name> <new_name> <new_description>")
         print("3. delete_project <project_name>")
-        print("4. list_projects")
+        print("4. list_projects [--format detail|table|json] [--limit N] [--page N]")
         print("5. create_task <project_name> <title> <description> [deadline]")
         print("6. edit_task <task_id> <new_title> <description> <status>")
         print("7. delete_task <task_id>")
         print("8. change_status <task_id> <status>")
-        print("9. list_tasks [project_name]")
-        print("10. show_overdue")
+        print("9. list_tasks [project_name] [--format detail|table|json] [--limit N] [--page N]")
+        print("10. show_overdue [--format detail|table|json] [--limit N] [--page N]")
         print("11. close_overdue")
         print("12. exit")
         print("\nStatus values: todo, doing, done")
@@ -147,6 +161,30 @@ def run_cli():
         
         return parts
     
+    def parse_list_options(args: list):
+        """Split --format/--limit/--page out of a list command's arguments."""
+        positional = []
+        options = {"output_format": "detail", "limit": None, "page": 1}
+        i = 0
+        try:
+            while i < len(args):
+                if args[i] == "--format":
+                    options["output_format"] = args[i + 1]
+                    i += 2
+                elif args[i] == "--limit":
+                    options["limit"] = int(args[i + 1])
+                    i += 2
+                elif args[i] == "--page":
+                    options["page"] = max(int(args[i + 1]), 1)
+                    i += 2
+                else:
+                    positional.append(args[i])
+                    i += 1
+        except (IndexError, ValueError):
+            print("Invalid list options. Use --format detail|table|json --limit N --page N")
+            return positional, None
+        return positional, options
+    
     def handle_command(command: str, parts: list, cli_commands: CLICommands):
         if command == "create_project" and len(parts) >= 3:
             name = parts[1]
@@ -164,7 +202,9 @@ def run_cli():
             cli_commands.delete_project(project_name)
         
         elif command == "list_projects":
-            cli_commands.list_projects()
+            args, options = parse_list_options(parts[1:])
+            if options is not None:
+                cli_commands.list_projects(**options)
         
         elif command == "create_task" and len(parts) >= 4:
             project_name = parts[1]
@@ -190,11 +230,15 @@ def run_cli():
             cli_commands.change_task_status(task_id, status)
         
         elif command == "list_tasks":
-            project_name = parts[1] if len(parts) > 1 else None
-            cli_commands.list_tasks(project_name)
+            args, options = parse_list_options(parts[1:])
+            if options is not None:
+                project_name = args[0] if args else None
+                cli_commands.list_tasks(project_name, **options)
         
         elif command == "show_overdue":
-            cli_commands.show_overdue_tasks()
+            args, options = parse_list_options(parts[1:])
+            if options is not None:
+                cli_commands.show_overdue_tasks(**options)
         
         elif command == "close_overdue":
             cli_commands.close_overdue_tasks()
@@ -211,4 +255,4 @@ if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "cli":
         run_cli()
     else:
-        run_api()
+        run_api(sys.argv[1:])